@@ -7,30 +7,102 @@
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QLineEdit, QScrollArea, QFrame, QSpacerItem,
-                           QSizePolicy, QProgressDialog)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                           QSizePolicy, QProgressDialog, QCheckBox, QSpinBox,
+                           QComboBox)
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from assets.utils.clut_card import ClutCard
 from assets.utils.notification_manager import NotificationManager
 from assets.utils.message_box import ClutMessageBox
 from assets.utils.clut_button import ClutButton
 from assets.pages.process_page import ProcessPage
 from assets.utils.progress_dialog import ClutProgressDialog
+from assets.utils.git_progress import GitProgressParser, TransferMeter, PHASE_GROUPS
+from assets.utils.git_profile import CLONE_PROFILE, DEFAULT_PROFILE, process_group_kwargs, terminate_process_tree
+from assets.utils.object_cache import ObjectCache, normalize_remote
+from assets.utils.trash_service import move_to_trash
+from assets.utils.clone_retry import RetryPolicy, classify_failure, failure_label
+from assets.utils.circuit_breaker import CircuitBreaker, remote_host
+from collections import deque
+import threading
+import shutil
+from assets.utils.sparse_picker import parse_github_repo, RemoteTreeLoader, SparsePathDialog
+from assets.utils.image_cache import load_card_icons
+from assets.utils.session_snapshot import SessionSnapshot, trim_repo, stale_text
+from assets.utils.github_events import follow_repo_events
+from assets.utils.github_repos import RepoListThread
+from assets.utils.http_client import HttpClient
+from assets.utils.rate_limit import BACKGROUND
+from assets.utils.archive_extract import (ProgressReader, extract_tarball, write_archive_marker,
+                                         read_archive_marker, ARCHIVE_MARKER)
+import codecs
 import os
 import git
 import json
-import requests
-from concurrent.futures import ThreadPoolExecutor
-import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import subprocess
 import time
+import re
+
+# 克隆模式: 模式名 -> (显示名称, git clone 参数)
+# 部分克隆(filter)保留完整提交历史，缺少的对象在需要时由 git 自动按需拉取
+CLONE_MODES = {
+    'shallow': ("浅克隆 (--depth 1)", ['--depth', '1']),
+    'blobless': ("无 blob 克隆 (--filter=blob:none)", ['--filter=blob:none']),
+    'treeless': ("无 tree 克隆 (--filter=tree:0)", ['--filter=tree:0']),
+    'blob_limit': ("限制文件大小 (--filter=blob:limit)", []),
+    'full': ("完整克隆", []),
+    # 不经过 git，直接下载 GitHub 源码归档并边下载边解压，之后可以转换为 git 仓库
+    'archive': ("源码归档 (无历史，下载 tarball)", []),
+}
+
+# 子模块只能用 git 拉取
+SUBMODULE_MODES = [mode for mode in CLONE_MODES if mode != 'archive']
+
+def clone_mode_args(mode, blob_limit="1m"):
+    """获取克隆模式对应的 git 参数"""
+    if mode == 'blob_limit':
+        return [f'--filter=blob:limit={blob_limit}']
+    return list(CLONE_MODES.get(mode, CLONE_MODES['shallow'])[1])
+
+# 更新已有克隆的方式: 方式名 -> 显示名称
+UPDATE_STRATEGIES = {
+    'ff': "快进合并 (merge --ff-only)",
+    'reset': "强制重置 (reset --hard)",
+}
+
+def clone_mode_label(mode, blob_limit="1m"):
+    """获取克隆模式的简短描述，显示在进程卡片上"""
+    if mode == 'blob_limit':
+        return f"blob:limit={blob_limit}"
+    return {
+        'shallow': "浅克隆",
+        'blobless': "blob:none",
+        'treeless': "tree:0",
+        'full': "完整克隆",
+        'archive': "源码归档",
+    }.get(mode, "浅克隆")
 
 class GitClonePage(QWidget):
-    def __init__(self):
+    def __init__(self, http=None):
         super().__init__()
         self.notification = NotificationManager()
         self.config_file = "config/git_config.json"
+        self.http = http or HttpClient.get_instance()  # 共享的 HTTP 客户端
+        self.repo_checkboxes = []  # 快捷克隆列表中的 (复选框, 仓库链接)
+        self.object_cache = ObjectCache("cache/objects.git")
+        self.sparse_paths = []  # 当前链接选中的稀疏检出目录
+        self.repo_list_thread = None  # 正在获取仓库列表的线程
+        self.repos_placeholder = None  # 仓库列表加载中的占位卡片
+        self.snapshot = SessionSnapshot.get_instance()
+        self.showing_snapshot = False  # 快捷克隆列表显示的是上次会话保存的离线数据
+        self.loaded_repos = []  # 本次获取到的仓库
+        self.repos_owner = None
+        self.repos_snapshot_time = None
+        self.repo_cards = {}  # html_url -> (快捷克隆卡片, 批量克隆选择框)
         self.setup_ui()
+        # 账户页开始监视后，仓库有变化时只更新对应的卡片
+        follow_repo_events(self, lambda: self.repos_owner)
         self.load_config()
 
     def setup_ui(self):
@@ -92,6 +164,147 @@ class GitClonePage(QWidget):
         path_card_layout.addWidget(path_widget)
         main_layout.addWidget(path_card)
 
+        # 克隆选项卡片
+        options_card = ClutCard(
+            title="克隆选项",
+            msg="配置克隆方式"
+        )
+        
+        options_widget = QWidget()
+        options_layout = QVBoxLayout(options_widget)
+        options_layout.setContentsMargins(20, 20, 20, 20)
+        options_layout.setSpacing(10)
+        
+        # 本地对象缓存
+        self.object_cache_cb = QCheckBox("使用本地对象缓存 (重复克隆和 fork 只下载缺少的对象)")
+        self.object_cache_cb.setStyleSheet("color: white; background: transparent;")
+        self.object_cache_cb.stateChanged.connect(self.on_clone_options_changed)
+        self.dissociate_cb = QCheckBox("克隆完成后解除对缓存的依赖 (--dissociate)")
+        self.dissociate_cb.setStyleSheet("color: white; background: transparent;")
+        self.dissociate_cb.stateChanged.connect(self.on_clone_options_changed)
+        
+        # 克隆模式
+        mode_layout = QHBoxLayout()
+        mode_label = QLabel("克隆模式:")
+        mode_label.setStyleSheet("color: white;")
+        self.clone_mode_combo = QComboBox()
+        for mode, (text, _) in CLONE_MODES.items():
+            self.clone_mode_combo.addItem(text, mode)
+        self.clone_mode_combo.setStyleSheet("""
+            QComboBox {
+                background: rgba(255, 255, 255, 0.1);
+                border: 1px solid rgba(255, 255, 255, 0.1);
+                border-radius: 4px;
+                color: white;
+                padding: 6px;
+            }
+            QComboBox::drop-down {
+                border: none;
+            }
+        """)
+        self.clone_mode_combo.currentIndexChanged.connect(self.on_clone_options_changed)
+        
+        # blob 大小上限，仅在 blob_limit 模式下可用
+        self.blob_limit_input = QLineEdit("1m")
+        self.blob_limit_input.setPlaceholderText("如 512k / 1m")
+        self.blob_limit_input.setFixedWidth(100)
+        self.blob_limit_input.setStyleSheet(self.path_input.styleSheet())
+        self.blob_limit_input.editingFinished.connect(self.on_clone_options_changed)
+        
+        # 源码归档下载的分支/标签/提交，仅在 archive 模式下可用
+        self.archive_ref_input = QLineEdit()
+        self.archive_ref_input.setPlaceholderText("分支/标签/提交，留空为默认分支")
+        self.archive_ref_input.setFixedWidth(220)
+        self.archive_ref_input.setStyleSheet(self.path_input.styleSheet())
+        
+        mode_layout.addWidget(mode_label)
+        mode_layout.addWidget(self.clone_mode_combo)
+        mode_layout.addWidget(self.blob_limit_input)
+        mode_layout.addWidget(self.archive_ref_input)
+        mode_layout.addStretch()
+        
+        # 稀疏检出
+        sparse_layout = QHBoxLayout()
+        sparse_label = QLabel("稀疏检出:")
+        sparse_label.setStyleSheet("color: white;")
+        self.sparse_status_label = QLabel("检出全部目录")
+        self.sparse_status_label.setStyleSheet("color: rgba(255,255,255,0.7);")
+        self.sparse_status_label.setWordWrap(True)
+        sparse_button = ClutButton("选择目录", primary=False)
+        sparse_button.clicked.connect(self.pick_sparse_paths)
+        sparse_clear_button = ClutButton("清除", primary=False)
+        sparse_clear_button.clicked.connect(lambda: self.set_sparse_paths([]))
+        
+        sparse_layout.addWidget(sparse_label)
+        sparse_layout.addWidget(self.sparse_status_label, 1)
+        sparse_layout.addWidget(sparse_button)
+        sparse_layout.addWidget(sparse_clear_button)
+        
+        # 目标已是同一仓库的克隆时的更新方式
+        update_layout = QHBoxLayout()
+        update_label = QLabel("更新方式:")
+        update_label.setStyleSheet("color: white;")
+        self.update_strategy_combo = QComboBox()
+        for strategy, text in UPDATE_STRATEGIES.items():
+            self.update_strategy_combo.addItem(text, strategy)
+        self.update_strategy_combo.setStyleSheet(self.clone_mode_combo.styleSheet())
+        self.update_strategy_combo.currentIndexChanged.connect(self.on_clone_options_changed)
+        
+        update_layout.addWidget(update_label)
+        update_layout.addWidget(self.update_strategy_combo)
+        update_layout.addStretch()
+        
+        # 子模块，每个子模块单独拉取，可以使用与主仓库不同的克隆模式
+        submodule_layout = QHBoxLayout()
+        self.submodule_cb = QCheckBox("同时克隆子模块")
+        self.submodule_cb.setStyleSheet("color: white; background: transparent;")
+        self.submodule_cb.stateChanged.connect(self.on_clone_options_changed)
+        submodule_jobs_label = QLabel("并行数:")
+        submodule_jobs_label.setStyleSheet("color: white;")
+        self.submodule_jobs_spin = QSpinBox()
+        self.submodule_jobs_spin.setRange(1, 16)
+        self.submodule_jobs_spin.setValue(8)
+        self.submodule_jobs_spin.setStyleSheet("""
+            QSpinBox {
+                background: rgba(255, 255, 255, 0.1);
+                border: 1px solid rgba(255, 255, 255, 0.1);
+                border-radius: 4px;
+                color: white;
+                padding: 6px;
+            }
+        """)
+        self.submodule_jobs_spin.valueChanged.connect(self.on_clone_options_changed)
+        submodule_mode_label = QLabel("子模块模式:")
+        submodule_mode_label.setStyleSheet("color: white;")
+        self.submodule_mode_combo = QComboBox()
+        for mode in SUBMODULE_MODES:
+            self.submodule_mode_combo.addItem(CLONE_MODES[mode][0], mode)
+        self.submodule_mode_combo.setStyleSheet(self.clone_mode_combo.styleSheet())
+        self.submodule_mode_combo.currentIndexChanged.connect(self.on_clone_options_changed)
+        
+        submodule_layout.addWidget(self.submodule_cb)
+        submodule_layout.addWidget(submodule_jobs_label)
+        submodule_layout.addWidget(self.submodule_jobs_spin)
+        submodule_layout.addWidget(submodule_mode_label)
+        submodule_layout.addWidget(self.submodule_mode_combo)
+        submodule_layout.addStretch()
+        
+        options_layout.addLayout(mode_layout)
+        options_layout.addLayout(sparse_layout)
+        options_layout.addLayout(update_layout)
+        options_layout.addLayout(submodule_layout)
+        # 浅克隆后在后台逐步补全历史
+        self.deepen_cb = QCheckBox("浅克隆完成后在后台逐步补全历史 (先可用，后完整)")
+        self.deepen_cb.setStyleSheet("color: white; background: transparent;")
+        self.deepen_cb.stateChanged.connect(self.on_clone_options_changed)
+        
+        options_layout.addWidget(self.deepen_cb)
+        options_layout.addWidget(self.object_cache_cb)
+        options_layout.addWidget(self.dissociate_cb)
+        
+        options_card.layout().addWidget(options_widget)
+        main_layout.addWidget(options_card)
+
         # Git仓库链接卡片
         repo_card = ClutCard(
             title="仓库链接",
@@ -110,6 +323,7 @@ class GitClonePage(QWidget):
         self.link_input = QLineEdit()
         self.link_input.setPlaceholderText("请输入Git仓库链接")
         self.link_input.setStyleSheet(self.path_input.styleSheet())
+        self.link_input.textChanged.connect(self.on_link_changed)
         
         clone_button = ClutButton("克隆", primary=True)
         clone_button.clicked.connect(self.clone_repository)
@@ -120,7 +334,31 @@ class GitClonePage(QWidget):
         
         repo_layout.addLayout(link_layout)
         
+        # 同时克隆数量
+        concurrent_layout = QHBoxLayout()
+        concurrent_label = QLabel("同时克隆数:")
+        concurrent_label.setStyleSheet("color: white;")
+        self.concurrent_spin = QSpinBox()
+        self.concurrent_spin.setRange(1, 8)
+        self.concurrent_spin.setValue(3)
+        self.concurrent_spin.setStyleSheet("""
+            QSpinBox {
+                background: rgba(255, 255, 255, 0.1);
+                border: 1px solid rgba(255, 255, 255, 0.1);
+                border-radius: 4px;
+                color: white;
+                padding: 6px;
+            }
+        """)
+        self.concurrent_spin.valueChanged.connect(self.on_concurrent_changed)
+        
+        concurrent_layout.addWidget(concurrent_label)
+        concurrent_layout.addWidget(self.concurrent_spin)
+        concurrent_layout.addStretch()
+        repo_layout.addLayout(concurrent_layout)
+        
         # 快捷克隆区域
+        quick_clone_header = QHBoxLayout()
         quick_clone_label = QLabel("快捷克隆")
         quick_clone_label.setStyleSheet("""
             QLabel {
@@ -130,7 +368,18 @@ class GitClonePage(QWidget):
                 margin-top: 16px;
             }
         """)
-        repo_layout.addWidget(quick_clone_label)
+        clone_selected_button = ClutButton("克隆所选", primary=False)
+        clone_selected_button.clicked.connect(self.clone_selected)
+        
+        # 显示离线数据时的提示
+        self.repos_status_label = QLabel()
+        self.repos_status_label.setStyleSheet("color: #FFB74A; font-size: 12px; margin-top: 16px;")
+        
+        quick_clone_header.addWidget(quick_clone_label)
+        quick_clone_header.addWidget(self.repos_status_label)
+        quick_clone_header.addStretch()
+        quick_clone_header.addWidget(clone_selected_button)
+        repo_layout.addLayout(quick_clone_header)
         
         # 仓库列表滚动区域
         scroll_area = QScrollArea()
@@ -207,67 +456,43 @@ class GitClonePage(QWidget):
             )
             return
             
-        # 从链接中提取仓库名
-        repo_name = repo_link.split('/')[-1]
-        if repo_name.endswith('.git'):
-            repo_name = repo_name[:-4]
-                
-        # 完整的克隆路径
-        clone_path = os.path.join(local_path, repo_name)
-        
-        # 检查目标路径是否已存在
-        if os.path.exists(clone_path):
-            result = ClutMessageBox.show_message(
-                self,
-                title="路径已存在",
-                text=f"目标路径 '{clone_path}' 已存在。\n是否覆盖现有内容？",
-                buttons=["确定", "取消"]
-            )
-            if result == "取消":
-                return
-                
-            # 修改删除逻辑，添加错误处理
-            try:
-                # 先尝试修改文件权限
-                import stat
-                def on_rm_error(func, path, exc_info):
-                    # 修改文件权限
-                    os.chmod(path, stat.S_IWRITE)
-                    # 再次尝试删除
-                    func(path)
-                    
-                # 使用错误处理函数删除目录
-                shutil.rmtree(clone_path, onerror=on_rm_error)
-            except Exception as e:
-                ClutMessageBox.show_message(
-                    self,
-                    title="删除失败",
-                    text=f"无法删除现有目录，请手动删除或选择其他位置。\n错误信息：{str(e)}",
-                    buttons=["确定"]
-                )
-                return
+        if not self.validate_clone_options():
+            return
+            
+        prepared = self.prepare_clone_path(local_path, repo_link)
+        if not prepared:
+            return
+        clone_path, action = prepared
         
         # 创建进度对话框
-        progress_dialog = ClutProgressDialog(self, title="克隆进度")
+        progress_dialog = ClutProgressDialog(
+            self,
+            title={'update': "更新进度", 'convert': "转换进度"}.get(action, "克隆进度")
+        )
         
-        # 创建并启动克隆线程
-        self.clone_thread = CloneThread(repo_link, clone_path)
+        # 创建克隆线程并加入队列
+        self.clone_thread = self.create_clone_thread(repo_link, clone_path, action)
         self.clone_thread.progress.connect(progress_dialog.set_status)
-        self.clone_thread.speed.connect(lambda s: progress_dialog.speed_label.setText(f"速度: {s} KB/s"))
+        self.clone_thread.progress_info.connect(progress_dialog.update_clone_progress)
+        
+        process_page = ProcessPage.get_instance()
+        process_page.enqueue_task(repo_url=repo_link, thread=self.clone_thread)
+        if process_page.clone_queue.is_pending(self.clone_thread):
+            progress_dialog.set_status("排队中，等待其他克隆任务完成...")
         
         # 处理克隆完成
         def on_clone_complete(success, message):
             if success:
                 progress_dialog.on_clone_complete()
                 
-        # 处理后台按钮点击
+        # 处理取消按钮点击
+        def on_cancel_clicked():
+            process_page.cancel_task(self.clone_thread)
+            progress_dialog.close()
+            
+        # 处理后台按钮点击，任务已在进程页面中
         def on_background_clicked():
             progress_dialog.close()
-            process_page = ProcessPage.get_instance()
-            process_page.add_task(
-                repo_url=repo_link,
-                thread=self.clone_thread
-            )
             # 在需要时导入
             from assets.utils.page_manager import PageManager
             PageManager.get_instance().slide_to_page("process_page")
@@ -284,14 +509,310 @@ class GitClonePage(QWidget):
             progress_dialog.close()
         
         # 连接按钮信号
+        progress_dialog.cancel_button.clicked.connect(on_cancel_clicked)
         progress_dialog.background_button.clicked.connect(on_background_clicked)
         progress_dialog.view_button.clicked.connect(on_view_clicked)
         progress_dialog.close_button.clicked.connect(on_close_clicked)
         self.clone_thread.finished.connect(on_clone_complete)
         
-        self.clone_thread.start()
         progress_dialog.exec_()
 
+    def clone_selected(self):
+        """将快捷克隆列表中选中的仓库全部加入克隆队列"""
+        local_path = self.path_input.text().strip()
+        if not local_path:
+            ClutMessageBox.show_message(
+                self,
+                title="路径错",
+                text="请先设置本地存储路径",
+                buttons=["确定"]
+            )
+            return
+            
+        if not self.validate_clone_options():
+            return
+            
+        selected = [url for checkbox, url in self.repo_checkboxes if checkbox.isChecked()]
+        if not selected:
+            self.notification.show_message(
+                title="未选择仓库",
+                msg="请先勾选要克隆的仓库",
+                duration=2000
+            )
+            return
+            
+        # 批量克隆时已是同一仓库的目录直接更新，同一仓库的归档下载转换为 git 仓库，
+        # 其他已存在的目录跳过，避免逐个弹窗确认。没有逐个确认，所以更新只做快进合并，
+        # 不使用会丢弃本地提交和修改的强制重置
+        process_page = ProcessPage.get_instance()
+        skipped = []
+        updated = 0
+        for repo_link in selected:
+            clone_path = os.path.join(local_path, self.get_repo_name(repo_link))
+            action = 'clone'
+            if os.path.exists(clone_path):
+                if self.is_clone_of(clone_path, repo_link):
+                    action = 'update'
+                elif self.is_archive_of(clone_path, repo_link) and self.clone_mode_combo.currentData() != 'archive':
+                    action = 'convert'
+                else:
+                    skipped.append(self.get_repo_name(repo_link))
+                    continue
+                updated += 1
+            process_page.enqueue_task(
+                repo_url=repo_link,
+                thread=self.create_clone_thread(repo_link, clone_path, action, update_strategy='ff')
+            )
+            
+        for checkbox, _ in self.repo_checkboxes:
+            checkbox.setChecked(False)
+            
+        msg = f"已加入队列: {len(selected) - len(skipped)} 个仓库"
+        if updated:
+            msg += f" (其中 {updated} 个更新已有目录)"
+        if skipped:
+            msg += f"\n已跳过(目录已存在): {', '.join(skipped)}"
+        self.notification.show_message(
+            title="批量克隆",
+            msg=msg,
+            duration=3000
+        )
+        
+        from assets.utils.page_manager import PageManager
+        PageManager.get_instance().slide_to_page("process_page")
+
+    def create_clone_thread(self, repo_link, clone_path, action='clone', update_strategy=None):
+        """按当前克隆选项创建克隆线程
+
+        action 为 clone 时新建克隆，update 时增量更新已有克隆，convert 时把归档下载转换为 git 仓库；
+        update_strategy 为空时使用界面上选择的更新方式
+        """
+        mode = self.clone_mode_combo.currentData()
+        is_current_link = repo_link == self.link_input.text().strip()
+        if action == 'clone' and mode == 'archive':
+            return ArchiveThread(
+                repo_link,
+                clone_path,
+                ref=self.archive_ref_input.text().strip() if is_current_link else "",
+                token=self.get_token(),
+                http=self.http
+            )
+        # 转换归档时按克隆模式补充历史，archive 模式下只拉取归档对应的那个提交
+        if mode == 'archive':
+            mode = 'shallow'
+            
+        reference = None
+        if self.object_cache_cb.isChecked():
+            reference = self.object_cache.reference_path()
+            
+        thread = CloneThread(
+            repo_link,
+            clone_path,
+            reference=reference,
+            dissociate=self.dissociate_cb.isChecked(),
+            mode=mode,
+            blob_limit=self.blob_limit_input.text().strip(),
+            sparse_paths=self.sparse_paths if is_current_link else None,
+            update_strategy=(update_strategy or self.update_strategy_combo.currentData()) if action == 'update' else None,
+            submodules=self.submodule_options(),
+            archive=read_archive_marker(clone_path) if action == 'convert' else None
+        )
+        
+        # 完整克隆成功后在后台把克隆目录中的对象拉取到缓存，供后续克隆和 fork 复用；
+        # 浅克隆、部分克隆和稀疏检出的目录缺少对象，从中拉取会触发网络下载，不更新
+        if self.object_cache_cb.isChecked() and mode == 'full' and not thread.sparse_paths:
+            def on_finished(success, _):
+                if success:
+                    self.object_cache.refresh_async(repo_link, clone_path)
+            thread.finished.connect(on_finished)
+            
+        # 浅克隆成功后启动低优先级的历史补全任务
+        if (action == 'clone' and self.deepen_cb.isChecked()
+                and self.clone_mode_combo.currentData() == 'shallow'):
+            def on_shallow_finished(success, _):
+                if success:
+                    self.start_deepen(repo_link, clone_path)
+            thread.finished.connect(on_shallow_finished)
+        return thread
+
+    def get_token(self):
+        """读取保存的 GitHub 令牌，未登录时返回 None"""
+        if not os.path.exists(self.config_file):
+            return None
+        with open(self.config_file, 'r') as f:
+            return json.load(f).get('password')
+
+    def submodule_options(self):
+        """当前的子模块选项，未启用时返回 None"""
+        if not self.submodule_cb.isChecked():
+            return None
+        return {
+            'jobs': self.submodule_jobs_spin.value(),
+            'mode': self.submodule_mode_combo.currentData(),
+        }
+
+    def start_deepen(self, repo_link, clone_path):
+        """在后台逐步加深浅克隆，其他克隆任务运行时自动暂停"""
+        process_page = ProcessPage.get_instance()
+        thread = DeepenThread(
+            repo_link,
+            clone_path,
+            busy_check=lambda: process_page.clone_queue.running_count() > 0
+        )
+        process_page.start_background_task(
+            repo_link,
+            thread,
+            title=f"补全历史 - {self.get_repo_name(repo_link)}"
+        )
+
+    def pick_sparse_paths(self):
+        """从远程目录树中选择稀疏检出的目录"""
+        repo_link = self.link_input.text().strip()
+        repo = parse_github_repo(repo_link)
+        if not repo:
+            ClutMessageBox.show_message(
+                self,
+                title="链接错误",
+                text="目录选择仅支持 GitHub 仓库链接，请先输入仓库链接",
+                buttons=["确定"]
+            )
+            return
+            
+        dialog = SparsePathDialog(
+            RemoteTreeLoader(*repo, token=self.get_token(), http=self.http),
+            selected=self.sparse_paths,
+            parent=self
+        )
+        if dialog.exec_():
+            self.set_sparse_paths(dialog.selected_paths())
+
+    def set_sparse_paths(self, paths):
+        """设置稀疏检出目录，为空时检出全部"""
+        self.sparse_paths = list(paths)
+        if self.sparse_paths:
+            self.sparse_status_label.setText(", ".join(self.sparse_paths))
+        else:
+            self.sparse_status_label.setText("检出全部目录")
+
+    def on_link_changed(self, _):
+        """链接变化后之前选的目录不再适用"""
+        if self.sparse_paths:
+            self.set_sparse_paths([])
+
+    def validate_clone_options(self):
+        """检查克隆选项是否有效"""
+        if 'blob_limit' in (self.clone_mode_combo.currentData(), self.submodule_mode_combo.currentData()):
+            if not re.fullmatch(r'\d+[kKmMgG]?', self.blob_limit_input.text().strip()):
+                ClutMessageBox.show_message(
+                    self,
+                    title="选项错误",
+                    text="文件大小上限格式错误，请输入数字加可选单位，如 512k、1m",
+                    buttons=["确定"]
+                )
+                return False
+        return True
+
+    def update_option_states(self):
+        """只在相关选项生效时启用依赖它的控件"""
+        self.dissociate_cb.setEnabled(self.object_cache_cb.isChecked())
+        self.deepen_cb.setEnabled(self.clone_mode_combo.currentData() == 'shallow')
+        self.blob_limit_input.setEnabled('blob_limit' in (self.clone_mode_combo.currentData(),
+                                                          self.submodule_mode_combo.currentData()))
+        self.submodule_jobs_spin.setEnabled(self.submodule_cb.isChecked())
+        self.submodule_mode_combo.setEnabled(self.submodule_cb.isChecked())
+        self.archive_ref_input.setEnabled(self.clone_mode_combo.currentData() == 'archive')
+
+    def on_clone_options_changed(self, _=None):
+        """克隆选项变化时保存配置"""
+        self.update_option_states()
+        self.save_config()
+
+    def get_repo_name(self, repo_link):
+        """从链接中提取仓库名"""
+        repo_name = repo_link.rstrip('/').split('/')[-1]
+        if repo_name.endswith('.git'):
+            repo_name = repo_name[:-4]
+        return repo_name
+
+    def is_clone_of(self, path, repo_link):
+        """目录是否为同一远程仓库的克隆"""
+        if not os.path.exists(os.path.join(path, '.git')):
+            return False
+        result = DEFAULT_PROFILE.run(
+            'remote', 'get-url', 'origin',
+            cwd=path,
+            capture_output=True,
+            text=True
+        )
+        return result.returncode == 0 and normalize_remote(result.stdout) == normalize_remote(repo_link)
+
+    def is_archive_of(self, path, repo_link):
+        """目录是否为同一远程仓库的源码归档下载"""
+        marker = read_archive_marker(path)
+        return bool(marker) and normalize_remote(marker.get('repo_link', '')) == normalize_remote(repo_link)
+
+    def prepare_clone_path(self, local_path, repo_link):
+        """计算克隆路径，目标已存在时询问更新、转换、覆盖或取消
+
+        返回 (克隆路径, 操作)，操作为 clone / update / convert，用户取消或删除失败时返回 None
+        """
+        # 完整的克隆路径
+        clone_path = os.path.join(local_path, self.get_repo_name(repo_link))
+        
+        # 检查目标路径是否已存在
+        if os.path.exists(clone_path):
+            if self.is_clone_of(clone_path, repo_link):
+                result = ClutMessageBox.show_message(
+                    self,
+                    title="仓库已存在",
+                    text=f"目标路径 '{clone_path}' 已是该仓库的克隆。\n"
+                         f"更新: 只拉取新的提交并{self.update_strategy_combo.currentText()}\n"
+                         f"覆盖: 删除后重新克隆",
+                    buttons=["更新", "覆盖", "取消"]
+                )
+                if result == "更新":
+                    return clone_path, 'update'
+            elif self.is_archive_of(clone_path, repo_link):
+                result = ClutMessageBox.show_message(
+                    self,
+                    title="归档已存在",
+                    text=f"目标路径 '{clone_path}' 是该仓库的源码归档下载。\n"
+                         f"转换: 保留现有文件，只拉取 git 历史，转换为 git 仓库\n"
+                         f"覆盖: 删除后重新下载",
+                    buttons=["转换", "覆盖", "取消"]
+                )
+                if result == "转换":
+                    return clone_path, 'convert'
+            else:
+                result = ClutMessageBox.show_message(
+                    self,
+                    title="路径已存在",
+                    text=f"目标路径 '{clone_path}' 已存在。\n是否覆盖现有内容？",
+                    buttons=["确定", "取消"]
+                )
+            if result == "取消":
+                return None
+                
+            # 先把目录重命名到回收区，克隆可以立即开始，实际删除在后台进行
+            try:
+                trash_path = move_to_trash(clone_path)
+            except Exception as e:
+                ClutMessageBox.show_message(
+                    self,
+                    title="删除失败",
+                    text=f"无法删除现有目录，请手动删除或选择其他位置。\n错误信息：{str(e)}",
+                    buttons=["确定"]
+                )
+                return None
+            ProcessPage.get_instance().start_deletion(trash_path)
+                
+        return clone_path, 'clone'
+
+    def on_concurrent_changed(self, value):
+        """修改同时克隆数量"""
+        ProcessPage.get_instance().set_max_concurrent(value)
+        self.save_config()
+
     def on_clone_finished(self, success, message):
         """克隆完成的回调函数"""
         if success:
@@ -343,38 +864,33 @@ class GitClonePage(QWidget):
                 self.show_login_reminder()
                 return
                 
-            for i in reversed(range(self.repos_layout.count())): 
-                self.repos_layout.itemAt(i).widget().setParent(None)
-                
-            # 获取仓库列表
-            headers = {
-                'Authorization': f'token {token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            response = requests.get(
-                f'https://api.github.com/users/{username}/repos',
-                headers=headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                repos = response.json()
-                
-                # 过滤掉个人配置仓库
-                repos = [repo for repo in repos if not repo['name'].endswith('profile')]
+            # 先显示上次会话保存的列表，获取完成后有变化才重新显示
+            self.loaded_repos = []
+            self.repos_owner = username
+            repos, self.repos_snapshot_time = self.snapshot.get('repos', owner=username)
+            self.showing_snapshot = repos is not None
+            if self.showing_snapshot:
+                self.show_repo_cards(repos)
+                self.repos_status_label.setText(f"离线数据({stale_text(self.repos_snapshot_time)})，正在更新...")
+            else:
+                self.clear_repo_cards()
+                # 第一页到达前显示占位卡片
+                self.repos_placeholder = ClutCard(
+                    title="正在加载仓库...",
+                    msg="正在从 GitHub 获取仓库列表"
+                )
+                self.repos_layout.addWidget(self.repos_placeholder)
                 
-                for repo in repos:
-                    repo_card = ClutCard(
-                        title=repo['name'],
-                        msg=repo['description'] or "暂无描述"
-                    )
-                    
-                    # 添加点击事件
-                    repo_url = repo['clone_url']
-                    repo_card.mousePressEvent = lambda _, url=repo_url: self.quick_clone(url)
-                    
-                    self.repos_layout.addWidget(repo_card)
+            # 在后台分页获取仓库列表，每到一页就显示一页
+            # 以页面为 parent，重新加载时旧线程仍在运行也不会被回收
+            # 快捷克隆列表属于预取，配额紧张时让位于用户操作
+            thread = RepoListThread(username=username, token=token, http=self.http,
+                                    priority=BACKGROUND, parent=self,
+                                    use_graphql=config.get('use_graphql', False))
+            thread.page_loaded.connect(lambda repos: self.on_repo_page_loaded(thread, repos))
+            thread.finished.connect(lambda success, msg: self.on_repo_list_finished(thread, success, msg))
+            self.repo_list_thread = thread
+            thread.start()
                     
         except Exception as e:
             print(f"加载仓库列表失败: {str(e)}")
@@ -384,6 +900,116 @@ class GitClonePage(QWidget):
                 duration=2000
             )
 
+    def on_repo_page_loaded(self, thread, repos):
+        """显示新获取到的一页仓库"""
+        # 重新加载后，之前的请求返回的结果不再显示
+        if thread is not self.repo_list_thread:
+            return
+        self.loaded_repos.extend(trim_repo(repo) for repo in repos)
+        if self.showing_snapshot:
+            return
+        self.remove_repos_placeholder()
+        self.add_repo_cards(repos)
+
+    def clear_repo_cards(self):
+        for i in reversed(range(self.repos_layout.count())): 
+            self.repos_layout.itemAt(i).widget().setParent(None)
+        self.repo_checkboxes = []
+        self.repos_placeholder = None
+        self.repo_cards = {}
+
+    def show_repo_cards(self, repos):
+        """重新显示整个列表，保留已勾选的批量克隆"""
+        checked = {url for checkbox, url in self.repo_checkboxes if checkbox.isChecked()}
+        self.clear_repo_cards()
+        self.add_repo_cards(repos)
+        for checkbox, url in self.repo_checkboxes:
+            checkbox.setChecked(url in checked)
+
+    def add_repo_cards(self, repos):
+        # 过滤掉个人配置仓库
+        repos = [repo for repo in repos if not repo['name'].endswith('profile')]
+        
+        avatar_cards = {}  # 所有者头像 URL -> 卡片
+        for repo in repos:
+            repo_card = self.create_repo_card(repo, avatar_cards)
+            self.repos_layout.addWidget(repo_card)
+        
+        # 所有者头像来自图片缓存，同一所有者只加载一次
+        load_card_icons(avatar_cards)
+
+    def create_repo_card(self, repo, avatar_cards):
+        """创建快捷克隆卡片，所有者头像 URL 记录到 avatar_cards 中"""
+        repo_card = ClutCard(
+            title=repo['name'],
+            msg=repo['description'] or "暂无描述"
+        )
+        
+        # 添加点击事件
+        repo_url = repo['clone_url']
+        repo_card.mousePressEvent = lambda _, url=repo_url: self.quick_clone(url)
+        
+        # 批量克隆选择框
+        checkbox = QCheckBox("加入批量克隆")
+        checkbox.setStyleSheet("color: white; background: transparent;")
+        repo_card.layout().addWidget(checkbox)
+        self.repo_checkboxes.append((checkbox, repo_url))
+        self.repo_cards[repo['html_url']] = (repo_card, checkbox)
+        
+        avatar_url = (repo.get('owner') or {}).get('avatar_url')
+        if avatar_url:
+            avatar_cards.setdefault(avatar_url, []).append(repo_card)
+        return repo_card
+
+    def replace_repo_card(self, repo, avatar_cards):
+        """事件监视发现仓库有变化，替换它的卡片并移到最前面，保留勾选状态"""
+        checked = self.remove_repo_card(repo['html_url'])
+        if repo['name'].endswith('profile'):
+            return
+        repo_card = self.create_repo_card(repo, avatar_cards)
+        self.repo_cards[repo['html_url']][1].setChecked(checked)
+        self.repos_layout.insertWidget(0, repo_card)
+
+    def remove_repo_card(self, repo_url):
+        """移除仓库卡片，返回它是否被勾选"""
+        entry = self.repo_cards.pop(repo_url, None)
+        if not entry:
+            return False
+        repo_card, checkbox = entry
+        self.repo_checkboxes = [item for item in self.repo_checkboxes if item[0] is not checkbox]
+        repo_card.setParent(None)
+        return checkbox.isChecked()
+
+    def on_repo_list_finished(self, thread, success, message):
+        """仓库列表获取结束"""
+        if thread is not self.repo_list_thread:
+            return
+        self.remove_repos_placeholder()
+        if success:
+            cached, _ = self.snapshot.get('repos', owner=self.repos_owner)
+            if self.showing_snapshot and self.loaded_repos != cached:
+                self.show_repo_cards(self.loaded_repos)
+            self.snapshot.put('repos', self.loaded_repos, owner=self.repos_owner)
+            self.showing_snapshot = False
+            self.repos_status_label.setText("")
+            return
+        
+        print(f"加载仓库列表失败: {message}")
+        if self.showing_snapshot:
+            # 保留快照中的列表
+            self.repos_status_label.setText(f"离线数据({stale_text(self.repos_snapshot_time)})，更新失败")
+            return
+        self.notification.show_message(
+            title="加载失败",
+            msg=f"无法获取仓库列表: {message}",
+            duration=2000
+        )
+
+    def remove_repos_placeholder(self):
+        if self.repos_placeholder:
+            self.repos_placeholder.setParent(None)
+            self.repos_placeholder = None
+
     def show_login_reminder(self):
         """显示登录提醒"""
         result = ClutMessageBox.show_message(
@@ -420,9 +1046,49 @@ class GitClonePage(QWidget):
                     last_path = config.get('clone_path')
                     if last_path and os.path.exists(last_path):
                         self.path_input.setText(last_path)
+                    cache_dir = config.get('object_cache_dir')
+                    if cache_dir:
+                        self.object_cache = ObjectCache(cache_dir)
+                    for checkbox, key in ((self.object_cache_cb, 'use_object_cache'),
+                                          (self.dissociate_cb, 'dissociate'),
+                                          (self.deepen_cb, 'progressive_deepen'),
+                                          (self.submodule_cb, 'clone_submodules')):
+                        checkbox.blockSignals(True)
+                        checkbox.setChecked(bool(config.get(key, False)))
+                        checkbox.blockSignals(False)
+                    mode_index = self.clone_mode_combo.findData(config.get('clone_mode', 'shallow'))
+                    if mode_index >= 0:
+                        self.clone_mode_combo.blockSignals(True)
+                        self.clone_mode_combo.setCurrentIndex(mode_index)
+                        self.clone_mode_combo.blockSignals(False)
+                    submodule_mode_index = self.submodule_mode_combo.findData(
+                        config.get('submodule_mode', 'shallow'))
+                    if submodule_mode_index >= 0:
+                        self.submodule_mode_combo.blockSignals(True)
+                        self.submodule_mode_combo.setCurrentIndex(submodule_mode_index)
+                        self.submodule_mode_combo.blockSignals(False)
+                    if config.get('submodule_jobs'):
+                        self.submodule_jobs_spin.blockSignals(True)
+                        self.submodule_jobs_spin.setValue(int(config['submodule_jobs']))
+                        self.submodule_jobs_spin.blockSignals(False)
+                    strategy_index = self.update_strategy_combo.findData(config.get('update_strategy', 'ff'))
+                    if strategy_index >= 0:
+                        self.update_strategy_combo.blockSignals(True)
+                        self.update_strategy_combo.setCurrentIndex(strategy_index)
+                        self.update_strategy_combo.blockSignals(False)
+                    if config.get('blob_limit'):
+                        self.blob_limit_input.setText(config['blob_limit'])
+                    max_concurrent = config.get('max_concurrent_clones')
+                    if max_concurrent:
+                        self.concurrent_spin.blockSignals(True)
+                        self.concurrent_spin.setValue(int(max_concurrent))
+                        self.concurrent_spin.blockSignals(False)
                         
-            # 加载用户仓库列表
-            self.load_user_repos()
+            ProcessPage.get_instance().set_max_concurrent(self.concurrent_spin.value())
+            self.update_option_states()
+                        
+            # 加载用户仓库列表，等窗口显示后再开始
+            QTimer.singleShot(0, self.load_user_repos)
                         
         except Exception as e:
             print(f"加载配置失败: {str(e)}")
@@ -437,6 +1103,16 @@ class GitClonePage(QWidget):
                 config = {}
                 
             config['clone_path'] = self.path_input.text()
+            config['max_concurrent_clones'] = self.concurrent_spin.value()
+            config['use_object_cache'] = self.object_cache_cb.isChecked()
+            config['dissociate'] = self.dissociate_cb.isChecked()
+            config['progressive_deepen'] = self.deepen_cb.isChecked()
+            config['clone_mode'] = self.clone_mode_combo.currentData()
+            config['blob_limit'] = self.blob_limit_input.text().strip()
+            config['update_strategy'] = self.update_strategy_combo.currentData()
+            config['clone_submodules'] = self.submodule_cb.isChecked()
+            config['submodule_jobs'] = self.submodule_jobs_spin.value()
+            config['submodule_mode'] = self.submodule_mode_combo.currentData()
             
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
             with open(self.config_file, 'w') as f:
@@ -445,113 +1121,634 @@ class GitClonePage(QWidget):
         except Exception as e:
             print(f"保存配置失败: {str(e)}")
 
-class RepoListThread(QThread):
-    def __init__(self, username):
-        super().__init__()
-        self.username = username
-        
-    def run(self):
-        try:
-            self.status.emit("正在获取仓库列表...")
-            
-            # 禁用 SSL 验证
-            import ssl
-            ssl._create_default_https_context = ssl._create_unverified_context
-            
-            # 设置请求头和超时时间
-            headers = {
-                'User-Agent': 'Mozilla/5.0',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            url = f'https://api.github.com/users/{self.username}/repos'
-            response = requests.get(
-                url, 
-                headers=headers,
-                verify=False,  # 禁用 SSL 验证
-                timeout=30     # 增加超时时间
-            )
-            
-            if response.status_code == 200:
-                repos = response.json()
-                self.finished.emit(True, repos)
-            else:
-                raise Exception(f"API 请求失败: {response.status_code}")
-                
-        except Exception as e:
-            self.finished.emit(False, str(e))
+class CloneCancelled(Exception):
+    """克隆任务被用户取消"""
+
+class GitCommandError(Exception):
+    """git 命令失败，stderr 保存 git 最后输出的若干行"""
+    def __init__(self, message, stderr=""):
+        super().__init__(message)
+        self.stderr = stderr
 
 class CloneThread(QThread):
     progress = pyqtSignal(str)  # 进度信号
+    progress_info = pyqtSignal(dict)  # 解析后的进度(阶段, 百分比, 字节数, 速度, 剩余时间)
     finished = pyqtSignal(bool, str)  # 完成信号(成功/失败, 消息)
-    speed = pyqtSignal(float)  # 添加速度信号，单位为 KB/s
+    speed = pyqtSignal(float)  # 平滑后的速度，单位为 KB/s
+    retry = pyqtSignal(str)  # 重试信息
+    submodule_status = pyqtSignal(str, str, str)  # (子模块路径, 状态, 说明)
+    submodule_progress = pyqtSignal(str, dict)  # (子模块路径, 解析后的进度)
+    phase_timings = pyqtSignal(dict)  # 各阶段累计耗时(秒): network / index-pack / checkout
     
-    def __init__(self, repo_link, clone_path):
+    def __init__(self, repo_link, clone_path, profile=CLONE_PROFILE,
+                 reference=None, dissociate=False, mode='shallow', blob_limit="1m",
+                 sparse_paths=None, update_strategy=None, retry_policy=None,
+                 submodules=None, archive=None):
         super().__init__()
         self.repo_link = repo_link
         self.clone_path = os.path.abspath(clone_path)
-        self._last_bytes = 0
-        self._last_time = time.time()
-
-    def _update_speed(self, current_bytes):
-        """更新克隆速度"""
-        current_time = time.time()
-        time_diff = current_time - self._last_time
-        if time_diff >= 1.0:  # 每秒更新一次速度
-            bytes_diff = current_bytes - self._last_bytes
-            speed = bytes_diff / 1024 / time_diff  # 转换为 KB/s
-            self.speed.emit(speed)
-            self._last_bytes = current_bytes
-            self._last_time = current_time
+        self.profile = profile
+        self.reference = reference  # 本地对象缓存路径
+        self.dissociate = dissociate
+        self.mode = mode
+        self.blob_limit = blob_limit
+        self.mode_label = clone_mode_label(mode, blob_limit)  # 显示在进程卡片上
+        self.sparse_paths = list(sparse_paths or [])  # 稀疏检出的目录
+        if self.sparse_paths:
+            self.mode_label += f" | 稀疏检出 {len(self.sparse_paths)} 个目录"
+        self.update_strategy = update_strategy  # 不为空时增量更新已有克隆
+        if update_strategy:
+            self.mode_label = "增量更新 (ff-only)" if update_strategy == 'ff' else "增量更新 (reset --hard)"
+        self.archive = archive  # 不为空时把该归档下载转换为 git 仓库
+        if archive:
+            self.mode_label = f"转换为 git 仓库 ({clone_mode_label(mode, blob_limit)})"
+        self.submodules = submodules  # 子模块选项 {'jobs': 并行数, 'mode': 克隆模式}，为空时不处理子模块
+        if submodules:
+            self.mode_label += f" | 子模块 {clone_mode_label(submodules['mode'], blob_limit)}"
+        self.parser = GitProgressParser()
+        self.timings = {}  # 各阶段耗时(秒)
+        self._phase_group = None  # 当前计时的阶段分类
+        self._phase_start = 0
+        self._network_start = None  # 当前网络命令的启动时间，收到服务器的第一行输出后清空
+        self.quarantined_path = None  # 取消后残留目录被移入的回收区路径
+        self._owns_path = False  # 目标目录是否由本任务创建，只有这时才能删除
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.attempts = []  # 每次尝试的 (模式, 是否续传, 耗时, 失败原因)
+        self._stderr_tail = deque(maxlen=20)
+        self._process = None
+        self._submodule_processes = set()
+        self._process_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self.breaker = CircuitBreaker.get_instance()
+        self.remote_host = remote_host(repo_link)  # 本地路径为 None，不经过熔断
 
-    def run(self):
+    def cancel(self):
+        """取消任务，结束整个 git 进程组，可从界面线程调用"""
+        self._cancelled.set()
+        process = self._process
+        if process is not None:
+            terminate_process_tree(process)
+        with self._process_lock:
+            submodule_processes = list(self._submodule_processes)
+        for process in submodule_processes:
+            terminate_process_tree(process)
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def _enter_phase(self, group):
+        """结束当前阶段的计时，开始 group 阶段，group 为 None 时只结束计时"""
+        now = time.monotonic()
+        if self._phase_group:
+            self.timings[self._phase_group] = self.timings.get(self._phase_group, 0) + now - self._phase_start
+            self.phase_timings.emit(dict(self.timings))
+        self._phase_group = group
+        self._phase_start = now
+
+    def _handle_output(self, lines):
+        """转发 git 输出行和解析出的进度"""
+        for line, info in lines:
+            self.progress.emit(line)
+            if not info:
+                self._stderr_tail.append(line)
+            # "Cloning into ..." 在连接之前就已输出，首字节按服务器的第一行输出或第一条进度计算
+            if self._network_start is not None and (info or line.startswith('remote:')):
+                self.timings.setdefault('first_byte', time.monotonic() - self._network_start)
+                self._network_start = None
+            if info:
+                group = PHASE_GROUPS.get(info['phase'])
+                if group and group != self._phase_group:
+                    self._enter_phase(group)
+                self.progress_info.emit(info)
+                self.speed.emit(info['speed'] / 1024)
+
+    def _run_git(self, *args, cwd=None):
+        """执行 git 命令，流式解析 stderr 中的进度，返回退出码"""
+        if self.is_cancelled():
+            raise CloneCancelled()
+        # 远程主机离线时不启动 git，直接失败
+        network = args[0] in ('clone', 'fetch')
+        if network:
+            self.breaker.check(self.remote_host)
+            
+        # git 用 \r 刷新进度行，按字节块读取 stderr 交给解析器切行
+        # 新建进程组，取消时连同 git-remote-https / index-pack 一起结束
+        start_time = time.monotonic()
+        process = self.profile.popen(
+            *args,
+            cwd=cwd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            **process_group_kwargs()
+        )
+        self._process = process
+        # 连接和协商阶段没有进度输出，计入网络耗时
+        self._enter_phase('network' if args[0] in ('clone', 'fetch') else None)
+        # 启动前已经取消的情况
+        if self.is_cancelled():
+            terminate_process_tree(process)
+        self._stderr_tail.clear()
+        self._network_start = start_time if network else None
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        
+        while True:
+            chunk = process.stderr.read1(4096)
+            if not chunk:
+                break
+            self._handle_output(self.parser.feed(decoder.decode(chunk)))
+        self._handle_output(self.parser.feed(decoder.decode(b'', final=True)))
+        self._handle_output(self.parser.flush())
         try:
-            self.progress.emit("正在克隆仓库...")
+            returncode = process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            terminate_process_tree(process, force=True)
+            returncode = process.wait()
+        self._enter_phase(None)
+        self._process = None
+        if self.is_cancelled():
+            raise CloneCancelled()
+        if network and returncode == 0:
+            self.breaker.record(self.remote_host, True)
+        elif network and classify_failure("\n".join(self._stderr_tail)) == 'timeout':
+            self.breaker.record(self.remote_host, False)
+        return returncode
+
+    def _check_git(self, *args, cwd=None, error="git 命令失败"):
+        """执行 git 命令，失败时抛出带有 stderr 的 GitCommandError"""
+        if self._run_git(*args, cwd=cwd) != 0:
+            raise GitCommandError(error, "\n".join(self._stderr_tail))
+
+    def _clone_once(self, mode, resume):
+        """执行一次克隆尝试，resume 时改为 init + fetch 写入目录"""
+        if resume:
+            self._fetch_into_directory(mode)
+            return
             
-            # 配置 git
-            git_cmds = [
-                ['git', 'config', '--global', 'http.sslVerify', 'false'],
-                ['git', 'config', '--global', 'https.sslVerify', 'false'],
-                # 增加缓冲区大小
-                ['git', 'config', '--global', 'http.postBuffer', '524288000'],
-                # 增加超时时间
-                ['git', 'config', '--global', 'http.lowSpeedLimit', '1000'],
-                ['git', 'config', '--global', 'http.lowSpeedTime', '300']
-            ]
+        # 上一次失败留下的不完整目录
+        self._remove_own_directory()
             
-            for cmd in git_cmds:
-                subprocess.run(cmd, check=True)
+        # 克隆命令，传输参数由 profile 以 -c 形式附加
+        clone_args = [
+            'clone',
+            '--progress',
+            *clone_mode_args(mode, self.blob_limit),
+        ]
+        if self.reference:
+            # 从本地对象缓存借用已有对象，缓存不可用时 git 会自动忽略
+            clone_args += ['--reference-if-able', self.reference]
+            if self.dissociate:
+                clone_args.append('--dissociate')
+        if self.sparse_paths:
+            # 先只检出根目录文件，再按选中目录设置 cone 模式
+            clone_args.append('--sparse')
+        clone_args += [self.repo_link, self.clone_path]
+        
+        self._check_git(*clone_args, error="克隆失败")
             
-            # 克隆命令
-            clone_cmd = [
-                'git',
-                'clone',
-                '--depth', '1',  # 浅克隆以加快速度
-                '--progress',
-                self.repo_link,
-                self.clone_path
-            ]
+        if self.sparse_paths:
+            self.progress.emit("正在检出选中目录...")
+            self._check_git('sparse-checkout', 'set', '--cone', *self.sparse_paths,
+                            cwd=self.clone_path, error="稀疏检出失败")
+
+    def _fetch_into_directory(self, mode):
+        """在已初始化的目录中 fetch 并检出，失败时目录保留，下一次尝试继续使用"""
+        if not os.path.exists(os.path.join(self.clone_path, '.git')):
+            self._remove_own_directory()
+            self._check_git('init', '--quiet', self.clone_path, error="初始化仓库失败")
+            self._check_git('remote', 'add', 'origin', self.repo_link,
+                            cwd=self.clone_path, error="添加远程仓库失败")
+                            
+        self._check_git('fetch', '--progress', *clone_mode_args(mode, self.blob_limit), 'origin',
+                        cwd=self.clone_path, error="拉取失败")
+        self._check_git('remote', 'set-head', 'origin', '--auto',
+                        cwd=self.clone_path, error="获取默认分支失败")
+        result = self.profile.run(
+            'symbolic-ref', '--short', 'refs/remotes/origin/HEAD',
+            cwd=self.clone_path,
+            capture_output=True,
+            text=True
+        )
+        branch = result.stdout.strip().split('/', 1)[-1] or 'main'
+        
+        if self.sparse_paths:
+            self._check_git('sparse-checkout', 'set', '--cone', *self.sparse_paths,
+                            cwd=self.clone_path, error="稀疏检出失败")
+        self.progress.emit("正在检出文件...")
+        self._check_git('checkout', '--progress', '-B', branch, '--track', f'origin/{branch}',
+                        cwd=self.clone_path, error="检出失败")
+
+    def _retry_summary(self, next_attempt, mode, resume, delay):
+        """生成显示在进程卡片上的重试信息"""
+        history = " | ".join(
+            f"#{i + 1} {reason} {seconds:.1f}s"
+            for i, (_, _, seconds, reason) in enumerate(self.attempts)
+        )
+        strategy = clone_mode_label(mode, self.blob_limit) + (", 续传" if resume else "")
+        return (f"第 {next_attempt + 1}/{self.retry_policy.max_attempts} 次尝试 ({strategy})，"
+                f"{delay:.1f} 秒后开始\n{history}")
+
+    def _remove_own_directory(self):
+        """删除本任务之前的尝试留下的目录，不属于本任务的目录不会删除"""
+        if self._owns_path and os.path.exists(self.clone_path):
+            shutil.rmtree(self.clone_path, ignore_errors=True)
+
+    def _claim_target(self):
+        """开始写入前确认目标目录可用，之后本任务留下的目录才能被删除或移入回收区"""
+        # 排队期间目标目录可能已被其他任务(如不同所有者的同名仓库)或用户创建，不能覆盖
+        if os.path.exists(self.clone_path) and os.listdir(self.clone_path):
+            raise Exception(f"目标目录已存在且不为空: {self.clone_path}")
+        self._owns_path = True
+
+    def _clone_with_retry(self):
+        """按重试策略反复尝试克隆，失败原因不可重试或次数用完时抛出异常"""
+        self._claim_target()
+        attempt = 0
+        while True:
+            mode, resume = self.retry_policy.plan(attempt, self.mode)
+            attempt_start = time.monotonic()
+            try:
+                self._clone_once(mode, resume)
+                self.attempts.append((mode, resume, time.monotonic() - attempt_start, None))
+                return
+            except GitCommandError as e:
+                kind = classify_failure(e.stderr)
+                self.attempts.append((mode, resume, time.monotonic() - attempt_start, failure_label(kind)))
+                attempt += 1
+                if not self.retry_policy.should_retry(kind, attempt):
+                    last_line = e.stderr.strip().splitlines()[-1] if e.stderr.strip() else str(e)
+                    raise Exception(f"{failure_label(kind)}: {last_line}")
+                    
+                delay = self.retry_policy.delay(attempt)
+                next_mode, next_resume = self.retry_policy.plan(attempt, self.mode)
+                self.retry.emit(self._retry_summary(attempt, next_mode, next_resume, delay))
+                self.progress.emit(f"{failure_label(kind)}，{delay:.1f} 秒后重试...")
+                # 等待期间可以被取消
+                if self._cancelled.wait(delay):
+                    raise CloneCancelled()
+
+    def _quarantine_partial_clone(self):
+        """把取消后残留的半成品目录移入回收区，由进程页面在后台删除"""
+        if not self._owns_path or not os.path.exists(self.clone_path):
+            return
+        try:
+            self.quarantined_path = move_to_trash(self.clone_path)
+        except Exception as e:
+            print(f"移除未完成的克隆目录失败: {str(e)}")
+
+    def _update_existing(self):
+        """拉取已有克隆的新对象，再按更新方式移动当前分支"""
+        self.progress.emit("正在拉取更新...")
+        if self._run_git('fetch', '--progress', '--prune', 'origin', cwd=self.clone_path) != 0:
+            raise Exception("拉取更新失败，请检查网络连接")
             
-            process = subprocess.Popen(
-                clone_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                encoding='utf-8'
-            )
+        self.progress.emit("正在更新工作区...")
+        if self.update_strategy == 'reset':
+            update_args = ['reset', '--hard', '@{upstream}']
+        else:
+            update_args = ['merge', '--ff-only', '@{upstream}']
+        if self._run_git(*update_args, cwd=self.clone_path) != 0:
+            if self.update_strategy == 'reset':
+                raise Exception("重置到远程分支失败")
+            raise Exception("无法快进合并，本地分支有未推送的提交或未提交的修改")
+
+    def _is_remote_branch(self, ref):
+        result = self.profile.run(
+            'ls-remote', '--exit-code', '--heads', 'origin', f'refs/heads/{ref}',
+            cwd=self.clone_path,
+            capture_output=True,
+            text=True
+        )
+        return result.returncode == 0
+
+    def _convert_archive(self):
+        """在归档下载的目录中初始化仓库并拉取对应提交的历史，工作区文件保持不变"""
+        commit = self.archive.get('commit')
+        if not commit:
+            raise Exception("归档中没有记录对应的提交，无法转换")
+        git_dir = os.path.join(self.clone_path, '.git')
+        try:
+            self._check_git('init', '--quiet', cwd=self.clone_path, error="初始化仓库失败")
+            self._check_git('remote', 'add', 'origin', self.repo_link,
+                            cwd=self.clone_path, error="添加远程仓库失败")
+            self.progress.emit("正在拉取历史...")
+            self._check_git('fetch', '--progress', *clone_mode_args(self.mode, self.blob_limit), 'origin', commit,
+                            cwd=self.clone_path, error="拉取失败")
+                            
+            # 归档来自分支时检出到同名分支并跟踪远程，否则停在该提交上
+            ref = self.archive.get('ref')
+            if ref and self._is_remote_branch(ref):
+                self._check_git('update-ref', f'refs/heads/{ref}', commit,
+                                cwd=self.clone_path, error="创建分支失败")
+                self._check_git('symbolic-ref', 'HEAD', f'refs/heads/{ref}',
+                                cwd=self.clone_path, error="创建分支失败")
+                self._check_git('config', f'branch.{ref}.remote', 'origin',
+                                cwd=self.clone_path, error="设置跟踪分支失败")
+                self._check_git('config', f'branch.{ref}.merge', f'refs/heads/{ref}',
+                                cwd=self.clone_path, error="设置跟踪分支失败")
+            else:
+                self._check_git('update-ref', '--no-deref', 'HEAD', commit,
+                                cwd=self.clone_path, error="检出提交失败")
+            # 只重建索引，工作区的文件本来就是这个提交的内容
+            self._check_git('reset', '--quiet', '--mixed', 'HEAD',
+                            cwd=self.clone_path, error="重建索引失败")
+        except BaseException:
+            # 转换失败时恢复为原来的归档目录
+            shutil.rmtree(git_dir, ignore_errors=True)
+            raise
+        os.remove(os.path.join(self.clone_path, ARCHIVE_MARKER))
+
+    def _submodule_paths(self):
+        """列出 .gitmodules 中已出现在工作区的子模块路径，稀疏检出之外的子模块会被跳过"""
+        if not os.path.exists(os.path.join(self.clone_path, '.gitmodules')):
+            return []
+        result = self.profile.run(
+            'config', '-z', '-f', '.gitmodules', '--get-regexp', r'^submodule\..*\.path$',
+            cwd=self.clone_path,
+            capture_output=True,
+            text=True
+        )
+        paths = []
+        for entry in result.stdout.split('\0'):
+            # -z 输出格式为 "键\n值"
+            _, _, path = entry.partition('\n')
+            if path and os.path.isdir(os.path.join(self.clone_path, path)):
+                paths.append(path)
+        return paths
+
+    def _update_submodule(self, path):
+        """拉取并检出单个子模块及其嵌套子模块，返回 (是否成功, 最后的错误输出)"""
+        if self.is_cancelled():
+            return False, "已取消"
+        self.submodule_status.emit(path, 'running', "正在拉取...")
+        parser = GitProgressParser()
+        tail = deque(maxlen=5)
+        
+        def handle(lines):
+            for line, info in lines:
+                if info:
+                    self.submodule_progress.emit(path, info)
+                else:
+                    tail.append(line)
+                    
+        process = self.profile.popen(
+            'submodule', 'update', '--init', '--recursive', '--progress',
+            *clone_mode_args(self.submodules['mode'], self.blob_limit),
+            '--', path,
+            cwd=self.clone_path,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            **process_group_kwargs()
+        )
+        with self._process_lock:
+            self._submodule_processes.add(process)
+        if self.is_cancelled():
+            terminate_process_tree(process)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        while True:
+            chunk = process.stderr.read1(4096)
+            if not chunk:
+                break
+            handle(parser.feed(decoder.decode(chunk)))
+        handle(parser.feed(decoder.decode(b'', final=True)))
+        handle(parser.flush())
+        returncode = process.wait()
+        with self._process_lock:
+            self._submodule_processes.discard(process)
+        return returncode == 0, "\n".join(tail)
+
+    def _update_submodules(self):
+        """并行拉取所有子模块，返回失败的子模块路径列表"""
+        paths = self._submodule_paths()
+        if not paths:
+            return []
+        start_time = time.monotonic()
+        # 先统一写入子模块配置，避免并行的 git 进程争抢 .git/config 的锁
+        self._check_git('submodule', 'init', '--', *paths, cwd=self.clone_path, error="初始化子模块失败")
+        for path in paths:
+            self.submodule_status.emit(path, 'pending', "等待中...")
             
-            while True:
-                output = process.stderr.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    self.progress.emit(output.strip())
-                    self._update_speed(process.stderr.tell())
+        failed = []
+        done = 0
+        self.progress.emit(f"正在拉取 {len(paths)} 个子模块...")
+        with ThreadPoolExecutor(max_workers=self.submodules['jobs']) as executor:
+            futures = {executor.submit(self._update_submodule, path): path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                success, error = future.result()
+                done += 1
+                if success:
+                    self.submodule_status.emit(path, 'success', "完成")
+                elif not self.is_cancelled():
+                    failed.append(path)
+                    last_line = error.strip().splitlines()[-1] if error.strip() else "拉取失败"
+                    self.submodule_status.emit(path, 'failed', last_line)
+                self.progress_info.emit({
+                    'percent': int(done / len(paths) * 100),
+                    'detail': f"子模块 {done}/{len(paths)}",
+                })
+        if self.is_cancelled():
+            raise CloneCancelled()
+        self.timings['submodules'] = time.monotonic() - start_time
+        return failed
+
+    def _finish_message(self, message, failed_submodules):
+        if failed_submodules:
+            return f"{message}，{len(failed_submodules)} 个子模块失败: {', '.join(failed_submodules)}"
+        return message
+
+    def run(self):
+        if self.archive:
+            try:
+                start_time = time.monotonic()
+                self._convert_archive()
+                failed = self._update_submodules() if self.submodules else []
+                self.timings['total'] = time.monotonic() - start_time
+                self.finished.emit(True, self._finish_message("转换成功", failed))
+            except CloneCancelled:
+                # 现有文件没有改动，保留目录
+                self.finished.emit(False, "已取消")
+            except Exception as e:
+                self.finished.emit(False, f"转换失败: {str(e)}")
+            return
+            
+        if self.update_strategy:
+            try:
+                start_time = time.monotonic()
+                self._update_existing()
+                failed = self._update_submodules() if self.submodules else []
+                self.timings['total'] = time.monotonic() - start_time
+                self.finished.emit(True, self._finish_message("更新成功", failed))
+            except CloneCancelled:
+                # 中断 fetch 不会破坏已有克隆，保留目录
+                self.finished.emit(False, "已取消")
+            except Exception as e:
+                self.finished.emit(False, f"更新失败: {str(e)}")
+            return
             
-            if process.returncode == 0:
-                self.finished.emit(True, "克隆成功")
+        try:
+            self.progress.emit("正在克隆仓库...")
+            start_time = time.monotonic()
+            
+            self._clone_with_retry()
+            failed = self._update_submodules() if self.submodules else []
+            
+            self.timings['total'] = time.monotonic() - start_time
+            if len(self.attempts) > 1:
+                self.finished.emit(True, self._finish_message(
+                    f"克隆成功 (第 {len(self.attempts)} 次尝试)", failed))
             else:
-                raise Exception("克隆失败，请检查网络连接")
+                self.finished.emit(True, self._finish_message("克隆成功", failed))
                 
+        except CloneCancelled:
+            self._quarantine_partial_clone()
+            self.finished.emit(False, "已取消")
+        except Exception as e:
+            self.finished.emit(False, f"克隆失败: {str(e)}")
+
+class DeepenThread(CloneThread):
+    """逐步加深浅克隆直到拥有完整历史
+
+    每一步用 --deepen 拉取更多提交，步长逐次翻倍，最后用 --unshallow 收尾。
+    其他克隆任务运行时暂停，正在进行的 fetch 会被中断并在稍后重新开始，
+    已经拉取到的历史不会丢失。
+    """
+    history = pyqtSignal(int, bool)  # (本地提交数, 是否已完整)
+
+    def __init__(self, repo_link, clone_path, busy_check=None,
+                 initial_step=50, unshallow_step=6400):
+        super().__init__(repo_link, clone_path)
+        self.busy_check = busy_check or (lambda: False)
+        self.initial_step = initial_step
+        self.unshallow_step = unshallow_step
+        self.mode_label = "渐进补全历史"
+        self._preempted = threading.Event()
+
+    def preempt(self):
+        """有其他任务需要带宽时中断当前 fetch，可从界面线程调用"""
+        self._preempted.set()
+        process = self._process
+        if process is not None:
+            terminate_process_tree(process)
+
+    def _git_output(self, *args):
+        result = self.profile.run(
+            *args,
+            cwd=self.clone_path,
+            capture_output=True,
+            text=True
+        )
+        return result.stdout.strip()
+
+    def _is_shallow(self):
+        return self._git_output('rev-parse', '--is-shallow-repository') == 'true'
+
+    def _commit_count(self):
+        count = self._git_output('rev-list', '--count', 'HEAD')
+        return int(count) if count.isdigit() else 0
+
+    def _wait_while_busy(self):
+        """其他克隆任务运行时等待"""
+        paused = False
+        while self.busy_check():
+            if not paused:
+                self.progress.emit("已暂停，等待其他克隆任务完成...")
+                paused = True
+            if self._cancelled.wait(2):
+                raise CloneCancelled()
+        self._preempted.clear()
+
+    def run(self):
+        try:
+            step = self.initial_step
+            self.history.emit(self._commit_count(), False)
+            while self._is_shallow():
+                self._wait_while_busy()
+                if step >= self.unshallow_step:
+                    self.progress.emit("正在拉取剩余的全部历史...")
+                    fetch_args = ['fetch', '--progress', '--unshallow', 'origin']
+                else:
+                    self.progress.emit(f"正在补全历史 (+{step} 个提交)...")
+                    fetch_args = ['fetch', '--progress', f'--deepen={step}', 'origin']
+                    
+                returncode = self._run_git(*fetch_args, cwd=self.clone_path)
+                if self._preempted.is_set():
+                    # 被其他任务打断，不算失败，等待后重新拉取这一步
+                    continue
+                if returncode != 0:
+                    raise Exception("拉取历史失败")
+                    
+                self.history.emit(self._commit_count(), False)
+                step *= 2
+                
+            count = self._commit_count()
+            self.history.emit(count, True)
+            self.finished.emit(True, f"历史已完整 ({count} 个提交)")
+            
+        except CloneCancelled:
+            # 浅克隆本身完好，取消只是停止补全
+            self.finished.emit(False, "已取消")
+        except Exception as e:
+            self.finished.emit(False, f"补全历史失败: {str(e)}")
+
+class ArchiveThread(CloneThread):
+    """下载 GitHub 源码归档，边下载边解压到克隆目录
+
+    不经过 git，没有 pack 协商、delta 解析和索引写入，适合只需要读代码或构建的场景。
+    目录中会记录归档的来源和对应提交，之后可以转换为 git 仓库。
+    """
+
+    def __init__(self, repo_link, clone_path, ref="", token=None, http=None):
+        super().__init__(repo_link, clone_path)
+        self.ref = ref
+        self.token = token
+        self.http = http or HttpClient.get_instance()
+        self.mode_label = f"源码归档 ({ref})" if ref else "源码归档"
+        self._meter = None
+        self._last_emit = 0
+
+    def _on_read(self, received):
+        """解压过程中每读取一块数据调用一次"""
+        if self.is_cancelled():
+            raise CloneCancelled()
+        info = self._meter.update(received)
+        now = time.monotonic()
+        if now - self._last_emit >= 0.2:
+            self._last_emit = now
+            self.progress_info.emit(info)
+            self.speed.emit(info['speed'] / 1024)
+
+    def run(self):
+        try:
+            repo = parse_github_repo(self.repo_link)
+            if not repo:
+                raise Exception("源码归档仅支持 GitHub 仓库")
+            owner, name = repo
+            self._claim_target()
+            ref = self.ref or RemoteTreeLoader(owner, name, self.token, http=self.http).default_branch()
+            
+            self.progress.emit(f"正在下载 {ref} 的源码归档...")
+            start_time = time.monotonic()
+            # stream=True 时按块读取响应，解压器直接从网络流中读取
+            with self.http.get(
+                f'https://api.github.com/repos/{owner}/{name}/tarball/{ref}',
+                token=self.token,
+                stream=True,
+                timeout=(5, 30)
+            ) as response:
+                if response.status_code != 200:
+                    raise Exception(f"下载归档失败: {response.status_code}")
+                self.timings['first_byte'] = time.monotonic() - start_time
+                self._meter = TransferMeter(int(response.headers.get('Content-Length', 0)))
+                commit = extract_tarball(ProgressReader(response.raw, self._on_read), self.clone_path)
+                
+            write_archive_marker(self.clone_path, self.repo_link, ref, commit)
+            self.timings['total'] = time.monotonic() - start_time
+            self.finished.emit(True, "下载完成")
+            
+        except CloneCancelled:
+            self._quarantine_partial_clone()
+            self.finished.emit(False, "已取消")
         except Exception as e:
-            self.finished.emit(False, f"克隆失败: {str(e)}")
\ No newline at end of file
+            # 解压到一半的目录没有用处，移入回收区
+            self._quarantine_partial_clone()
+            self.finished.emit(False, f"下载失败: {str(e)}")
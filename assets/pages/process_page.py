@@ -1,13 +1,19 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QProgressBar, QScrollArea)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from assets.utils.clut_card import ClutCard
+from assets.utils.clut_button import ClutButton
+from assets.utils.clone_queue import CloneQueue
+from assets.utils.git_progress import format_size, format_eta
+from assets.utils.trash_service import DeleteThread, pending_trash
+import os
 from datetime import datetime
 
 class ProcessCard(ClutCard):
-    def __init__(self, title, repo_url):
+    def __init__(self, title, repo_url, mode=""):
         super().__init__(title=title, msg=f"仓库: {repo_url}")
         self.repo_url = repo_url
+        self.mode = mode  # 克隆模式描述
         self.content_layout = self.layout()
         self.setup_process_ui()
         self.setMinimumHeight(180)
@@ -50,11 +56,26 @@ class ProcessCard(ClutCard):
             }
         """)
         
+        # 克隆模式
+        self.mode_label = QLabel(f"模式: {self.mode}")
+        self.mode_label.setStyleSheet("""
+            QLabel {
+                color: #8B5CF6;
+                font-size: 12px;
+            }
+        """)
+        self.mode_label.setVisible(bool(self.mode))
+        
         info_layout.addWidget(self.status_label)
         info_layout.addStretch()
+        info_layout.addWidget(self.mode_label)
         info_layout.addWidget(self.speed_label)
         info_layout.addWidget(time_label)
         
+        # 取消按钮，由 ProcessPage 连接
+        self.cancel_button = ClutButton("取消", primary=False)
+        info_layout.addWidget(self.cancel_button)
+        
         # 进度条
         self.progress_bar = QProgressBar()
         self.progress_bar.setStyleSheet("""
@@ -98,9 +119,64 @@ class ProcessCard(ClutCard):
         
         url_layout.addWidget(url_label)
         
+        # 本地历史，渐进补全历史的任务才显示
+        self.history_label = QLabel()
+        self.history_label.setStyleSheet("""
+            QLabel {
+                color: rgba(255,255,255,0.7);
+                font-size: 12px;
+            }
+        """)
+        self.history_label.hide()
+        
+        # 各阶段耗时，克隆开始输出进度后显示
+        self.timing_label = QLabel()
+        self.timing_label.setStyleSheet("""
+            QLabel {
+                color: rgba(255,255,255,0.5);
+                font-size: 12px;
+            }
+        """)
+        self.timing_label.hide()
+        
+        # 重试信息，出现重试时才显示
+        self.retry_label = QLabel()
+        self.retry_label.setStyleSheet("""
+            QLabel {
+                color: #FFB74A;
+                font-size: 12px;
+            }
+        """)
+        self.retry_label.setWordWrap(True)
+        self.retry_label.hide()
+        
+        # 子任务(如子模块)列表，出现子任务时才显示
+        self.children = {}
+        self.children_container = QWidget()
+        self.children_layout = QVBoxLayout(self.children_container)
+        self.children_layout.setContentsMargins(0, 0, 0, 0)
+        self.children_layout.setSpacing(4)
+        self.children_scroll = QScrollArea()
+        self.children_scroll.setWidget(self.children_container)
+        self.children_scroll.setWidgetResizable(True)
+        self.children_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.children_scroll.setMaximumHeight(160)
+        self.children_scroll.setStyleSheet("""
+            QScrollArea {
+                border: none;
+                background: rgba(255, 255, 255, 0.03);
+                border-radius: 6px;
+            }
+        """)
+        self.children_scroll.hide()
+        
         # 添加所有组件到主布局
         layout.addLayout(info_layout)
+        layout.addWidget(self.retry_label)
+        layout.addWidget(self.history_label)
         layout.addWidget(self.progress_bar)
+        layout.addWidget(self.timing_label)
+        layout.addWidget(self.children_scroll)
         layout.addWidget(url_container)
         layout.addStretch(1)
         
@@ -111,21 +187,109 @@ class ProcessCard(ClutCard):
         """更新状态文本"""
         self.status_label.setText(text)
         
+    def set_history(self, commits, complete):
+        """显示本地已有的历史提交数"""
+        if complete:
+            self.history_label.setText(f"本地历史: {commits} 个提交 (已完整)")
+        else:
+            self.history_label.setText(f"本地历史: {commits} 个提交 (补全中)")
+        self.history_label.show()
+        
+    def _child_row(self, key):
+        """获取子任务行，不存在时创建"""
+        if key in self.children:
+            return self.children[key]
+        row = QWidget()
+        row_layout = QHBoxLayout(row)
+        row_layout.setContentsMargins(8, 2, 8, 2)
+        row_layout.setSpacing(8)
+        
+        name_label = QLabel(key)
+        name_label.setStyleSheet("color: rgba(255,255,255,0.8); font-size: 12px;")
+        name_label.setFixedWidth(200)
+        progress_bar = QProgressBar()
+        progress_bar.setTextVisible(False)
+        progress_bar.setFixedHeight(4)
+        status_label = QLabel()
+        status_label.setStyleSheet("color: rgba(255,255,255,0.6); font-size: 12px;")
+        status_label.setFixedWidth(220)
+        
+        row_layout.addWidget(name_label)
+        row_layout.addWidget(progress_bar, 1)
+        row_layout.addWidget(status_label)
+        self.children_layout.addWidget(row)
+        
+        self.children[key] = (progress_bar, status_label)
+        self._set_child_color(key, "#4A9EFF")
+        if not self.children_scroll.isVisible():
+            self.children_scroll.show()
+            self.setMaximumHeight(290 + self.children_scroll.maximumHeight())
+        return self.children[key]
+        
+    def _set_child_color(self, key, color):
+        progress_bar, _ = self.children[key]
+        progress_bar.setStyleSheet(f"""
+            QProgressBar {{
+                background: rgba(255, 255, 255, 0.1);
+                border: none;
+                border-radius: 2px;
+            }}
+            QProgressBar::chunk {{
+                background: {color};
+                border-radius: 2px;
+            }}
+        """)
+        
+    def set_child_status(self, key, state, text):
+        """更新子任务状态，state 为 pending / running / success / failed"""
+        progress_bar, status_label = self._child_row(key)
+        status_label.setText(text)
+        status_label.setToolTip(text)
+        if state == 'success':
+            progress_bar.setValue(progress_bar.maximum())
+            self._set_child_color(key, "#4CAF50")
+        elif state == 'failed':
+            self._set_child_color(key, "#FF4A4A")
+            
+    def update_child_progress(self, key, info):
+        """根据 GitProgressParser 的进度信息更新子任务进度"""
+        progress_bar, status_label = self._child_row(key)
+        progress_bar.setValue(info['percent'])
+        status_label.setText(f"{format_size(info['bytes'])} | {format_size(info['speed'])}/s")
+        
+    def set_timings(self, timings):
+        """显示各阶段耗时，便于判断该仓库的瓶颈在网络、索引还是检出"""
+        parts = [f"{label} {timings[key]:.1f}s"
+                 for key, label in (('network', "网络"), ('index-pack', "索引"), ('checkout', "检出"))
+                 if key in timings]
+        if not parts:
+            return
+        self.timing_label.setText("耗时: " + " | ".join(parts))
+        self.timing_label.show()
+        
+    def set_retry_info(self, text):
+        """显示重试次数和每次尝试的耗时"""
+        self.retry_label.setText(text)
+        self.retry_label.show()
+        
     def update_progress(self, value, total, speed):
         """更新进度和速度"""
-        percentage = int(value / total * 100) if total else 0
-        self.progress_bar.setValue(value)
         self.progress_bar.setMaximum(total if total else 100)
+        self.progress_bar.setValue(value)
+        self.speed_label.setText(f"速度: {format_size(speed)}/s")
         
-        # 更新速度显示
-        if speed < 1024:
-            speed_text = f"{speed} B/s"
-        elif speed < 1024 * 1024:
-            speed_text = f"{speed/1024:.1f} KB/s"
-        else:
-            speed_text = f"{speed/1024/1024:.1f} MB/s"
-            
-        self.speed_label.setText(f"速度: {speed_text}")
+    def update_clone_progress(self, info):
+        """根据 GitProgressParser 的进度信息更新进度条、速度和剩余时间"""
+        if 'detail' in info:
+            # 非传输类任务(如后台删除)只提供进度和说明文字
+            self.progress_bar.setMaximum(100)
+            self.progress_bar.setValue(info['percent'])
+            self.speed_label.setText(info['detail'])
+            return
+        self.update_progress(info['percent'], 100, info['speed'])
+        self.speed_label.setText(
+            f"速度: {format_size(info['speed'])}/s | {format_size(info['bytes'])} | 剩余: {format_eta(info['eta'])}"
+        )
 
 class ProcessPage(QWidget):
     _instance = None
@@ -142,9 +306,17 @@ class ProcessPage(QWidget):
             raise Exception("ProcessPage 是单例类，请使用 get_instance() 方法获取实例")
         super().__init__()
         self.tasks = {}  # 存储所有任务
+        self.background_tasks = set()  # 低优先级任务，克隆开始时让出带宽
+        # 克隆队列，限制同时运行的克隆数量
+        self.clone_queue = CloneQueue(max_workers=3, parent=self)
+        self.clone_queue.task_started.connect(self._on_task_started)
+        self.clone_queue.queue_changed.connect(self._on_queue_changed)
         self.setup_ui()
         ProcessPage._instance = self
         
+        # 继续删除上次退出时没有删完的目录
+        QTimer.singleShot(0, self.resume_deletions)
+        
     def setup_ui(self):
         # 主布局
         layout = QVBoxLayout(self)
@@ -166,8 +338,13 @@ class ProcessPage(QWidget):
         subtitle = QLabel("Process Management")
         subtitle.setStyleSheet("color: rgba(255,255,255,0.5); font-size: 14px;")
         
+        # 队列状态
+        self.queue_label = QLabel("运行中: 0 | 等待中: 0")
+        self.queue_label.setStyleSheet("color: rgba(255,255,255,0.7); font-size: 12px;")
+        
         title_layout.addWidget(title)
         title_layout.addWidget(subtitle)
+        title_layout.addWidget(self.queue_label)
         
         # 创建一个包含滚动区域的容器
         scroll_container = QWidget()
@@ -223,7 +400,7 @@ class ProcessPage(QWidget):
         # 设置任务容器的最小高度
         self.task_container.setMinimumHeight(300)
         
-    def add_task(self, repo_url, thread):
+    def add_task(self, repo_url, thread, title=None):
         """添加新任务"""
         # 移除之前的弹性空间
         for i in reversed(range(self.task_layout.count())):
@@ -232,7 +409,11 @@ class ProcessPage(QWidget):
                 self.task_layout.removeItem(item)
         
         # 添加新任务卡片
-        task_card = ProcessCard(f"克隆任务 - {repo_url.split('/')[-1]}", repo_url)
+        task_card = ProcessCard(
+            title or f"克隆任务 - {repo_url.split('/')[-1]}",
+            repo_url,
+            mode=getattr(thread, 'mode_label', "")
+        )
         self.task_layout.addWidget(task_card)
         self.tasks[thread] = task_card
         
@@ -240,9 +421,81 @@ class ProcessPage(QWidget):
         self.task_layout.addStretch()
         
         # 连接信号
+        if hasattr(thread, 'cancel'):
+            task_card.cancel_button.clicked.connect(lambda: self.cancel_task(thread))
+        else:
+            task_card.cancel_button.hide()
         thread.progress.connect(lambda msg: self._update_task(thread, msg))
+        thread.progress_info.connect(task_card.update_clone_progress)
+        if hasattr(thread, 'retry'):
+            thread.retry.connect(task_card.set_retry_info)
+        if hasattr(thread, 'history'):
+            thread.history.connect(task_card.set_history)
+        if hasattr(thread, 'phase_timings'):
+            thread.phase_timings.connect(task_card.set_timings)
+        if hasattr(thread, 'submodule_status'):
+            thread.submodule_status.connect(task_card.set_child_status)
+            thread.submodule_progress.connect(task_card.update_child_progress)
         thread.finished.connect(lambda success, msg: self._on_task_finished(thread, success, msg))
         
+        return task_card
+        
+    def enqueue_task(self, repo_url, thread):
+        """添加任务卡片并放入克隆队列，等待空闲槽位后启动"""
+        task_card = self.add_task(repo_url, thread)
+        task_card.set_status("排队中...")
+        self.clone_queue.enqueue(thread)
+        return task_card
+        
+    def cancel_task(self, thread):
+        """取消任务并立即释放克隆队列中的槽位"""
+        card = self.tasks.get(thread)
+        if self.clone_queue.cancel(thread):
+            # 还在排队，线程没有启动，直接标记为已取消
+            if card:
+                self._on_task_finished(thread, False, "已取消")
+            return
+        thread.cancel()
+        if card:
+            card.cancel_button.setEnabled(False)
+            card.set_status("正在取消...")
+        
+    def start_background_task(self, repo_url, thread, title=None):
+        """启动低优先级任务，不占用克隆队列槽位，克隆开始时会被打断让出带宽"""
+        self.add_task(repo_url, thread, title=title)
+        self.background_tasks.add(thread)
+        thread.finished.connect(lambda *_: self.background_tasks.discard(thread))
+        thread.start()
+        return thread
+        
+    def start_deletion(self, trash_path):
+        """在后台删除回收区中的目录，不占用克隆队列的槽位"""
+        thread = DeleteThread(trash_path)
+        self.add_task(trash_path, thread, title=f"删除任务 - {os.path.basename(trash_path)}")
+        thread.start()
+        return thread
+        
+    def resume_deletions(self):
+        """启动时继续删除遗留的回收区目录"""
+        for trash_path in pending_trash():
+            self.start_deletion(trash_path)
+        
+    def set_max_concurrent(self, count):
+        """设置同时运行的克隆数量"""
+        self.clone_queue.set_max_workers(count)
+        
+    def _on_task_started(self, thread):
+        """队列启动任务"""
+        if thread in self.tasks:
+            self.tasks[thread].set_status("正在启动...")
+        # 让后台任务暂停，把带宽让给新的克隆
+        for task in list(self.background_tasks):
+            task.preempt()
+            
+    def _on_queue_changed(self, running, pending):
+        """更新队列状态"""
+        self.queue_label.setText(f"运行中: {running} | 等待中: {pending}")
+        
     def _update_task(self, thread, message):
         """更新任务状态"""
         if thread in self.tasks:
@@ -252,13 +505,26 @@ class ProcessPage(QWidget):
         """处理任务完成"""
         if thread in self.tasks:
             card = self.tasks[thread]
+            card.cancel_button.hide()
+            # 取消后残留的目录已被移入回收区，在后台删除
+            if getattr(thread, 'quarantined_path', None):
+                self.start_deletion(thread.quarantined_path)
+                thread.quarantined_path = None
             if success:
                 card.set_status("完成")
+                card.progress_bar.setValue(card.progress_bar.maximum())
                 card.setStyleSheet("""
                     QProgressBar::chunk {
                         background: #4CAF50;
                     }
                 """)
+            elif message == "已取消":
+                card.set_status("已取消")
+                card.setStyleSheet("""
+                    QProgressBar::chunk {
+                        background: #888888;
+                    }
+                """)
             else:
                 card.set_status(f"失败: {message}")
                 card.setStyleSheet("""
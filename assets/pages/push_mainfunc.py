@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QScrollArea, QFrame, QComboBox, QLineEdit, QTextEdit, QCheckBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from git import Repo
 from typing import Dict, List, Tuple
 from assets.utils.clut_card import ClutCard
@@ -8,6 +8,11 @@ from assets.utils.notification_manager import NotificationManager
 from assets.utils.message_box import ClutMessageBox
 from assets.utils.clut_button import ClutButton
 from assets.pages.process_page import ProcessPage
+from assets.utils.git_profile import DEFAULT_PROFILE
+from assets.utils.trash_service import TRASH_DIR_NAME
+from assets.utils.network_worker import NetworkWorker
+from assets.utils.session_snapshot import SessionSnapshot
+from assets.utils.circuit_breaker import CircuitBreaker, remote_host
 import os
 
 class PushMainFuncPage(QWidget):
@@ -16,8 +21,12 @@ class PushMainFuncPage(QWidget):
         self.notification = NotificationManager()
         self.process_page = ProcessPage.get_instance()
         self.repos = []  # 存储找到的所有Git仓库
+        self.snapshot = SessionSnapshot.get_instance()
         self.setup_ui()
         
+        # 窗口显示后恢复上次会话的仓库
+        QTimer.singleShot(0, self.restore_snapshot)
+        
     def setup_ui(self):
         # 主布局
         main_layout = QVBoxLayout(self)
@@ -228,12 +237,10 @@ class PushMainFuncPage(QWidget):
 
     def get_colored_diff(self, repo_path: str, file_path: str) -> str:
         """获取带颜色的diff输出"""
-        import subprocess
-        
         try:
             # 使用git diff命令并保留颜色输出
-            process = subprocess.run(
-                ['git', 'diff', '--color=always', file_path],  # --color=always 强制启用颜色
+            process = DEFAULT_PROFILE.run(
+                'diff', '--color=always', file_path,  # --color=always 强制启用颜色
                 cwd=repo_path,
                 capture_output=True,
                 text=True,
@@ -250,18 +257,68 @@ class PushMainFuncPage(QWidget):
 
     def scan_git_repos(self, root_path: str):
         """扫描目录下的所有Git仓库"""
-        self.repos.clear()
-        self.repo_combo.clear()
-        
+        self.set_repos(self.find_git_repos(root_path))
+        self.save_snapshot()
+
+    @staticmethod
+    def find_git_repos(root_path: str) -> List[str]:
+        """返回目录下所有Git仓库的路径，不访问界面，可以在后台线程中调用"""
+        paths = []
         for root, dirs, files in os.walk(root_path):
+            if TRASH_DIR_NAME in dirs:
+                dirs.remove(TRASH_DIR_NAME)  # 跳过等待后台删除的目录
             if '.git' in dirs:
-                try:
-                    repo = Repo(root)
-                    self.repos.append(repo)
-                    self.repo_combo.addItem(os.path.basename(root), root)
-                except Exception:
-                    continue
+                paths.append(root)
                 dirs.remove('.git')  # 不继续扫描.git目录
+        return paths
+
+    def set_repos(self, paths: List[str], selected: str = None):
+        """显示仓库列表，和当前列表相同时不做改动"""
+        if paths == [self.repo_combo.itemData(i) for i in range(self.repo_combo.count())]:
+            return
+        selected = selected or self.repo_combo.currentData()
+        # 填充完成后只触发一次选择，不为中间状态刷新变更
+        self.repo_combo.blockSignals(True)
+        self.repos.clear()
+        self.repo_combo.clear()
+        
+        for path in paths:
+            try:
+                repo = Repo(path)
+            except Exception:
+                continue
+            self.repos.append(repo)
+            self.repo_combo.addItem(os.path.basename(path), path)
+        
+        index = self.repo_combo.findData(selected) if selected else -1
+        if index >= 0:
+            self.repo_combo.setCurrentIndex(index)
+        self.repo_combo.blockSignals(False)
+        self.on_repo_selected(self.repo_combo.currentIndex())
+
+    def save_snapshot(self):
+        """保存当前目录和选中的仓库，下次启动时直接恢复"""
+        self.snapshot.put('push', {
+            'root': self.path_input.text(),
+            'repos': [self.repo_combo.itemData(i) for i in range(self.repo_combo.count())],
+            'repo': self.repo_combo.currentData(),
+        })
+
+    def restore_snapshot(self):
+        """先显示上次会话的仓库列表，再在后台重新扫描目录，有变化时更新"""
+        data, _ = self.snapshot.get('push')
+        if not data or not os.path.isdir(data.get('root') or ''):
+            return
+        self.path_input.setText(data['root'])
+        self.set_repos([path for path in data['repos'] if os.path.isdir(path)], data.get('repo'))
+        
+        def on_scanned(paths):
+            if self.path_input.text() == data['root']:
+                self.set_repos(paths)
+                self.save_snapshot()
+                
+        # 扫描大目录较慢，放到后台线程
+        NetworkWorker.get_instance().submit(self.find_git_repos, data['root'], on_success=on_scanned)
 
     def browse_path(self):
         """浏览选择仓库路径"""
@@ -281,6 +338,7 @@ class PushMainFuncPage(QWidget):
         if index >= 0:
             repo_path = self.repo_combo.itemData(index)
             repo = Repo(repo_path)
+            self.save_snapshot()
             self.branch_combo.clear()
             
             # 添加本地分支
@@ -332,17 +390,30 @@ class PushMainFuncPage(QWidget):
             if self.delete_remote_cb.isChecked():
                 push_options.append("--delete")
             
-            # 执行推送
-            result = current_repo.git.push(
+            def on_success(_):
+                self.notification.show_message(
+                    title="推送成功",
+                    msg=f"已推送到 {target_branch}",
+                    duration=2000
+                )
+                
+            def on_error(error):
+                self.notification.show_message(
+                    title="推送失败",
+                    msg=error,
+                    duration=3000
+                )
+            
+            # 推送需要访问网络，在后台执行；远程主机离线时 guard 直接失败，不等待超时
+            NetworkWorker.get_instance().submit(
+                CircuitBreaker.get_instance().guard,
+                remote_host(current_repo.remotes.origin.url),
+                current_repo.git.push,
                 "origin",
                 target_branch,
-                *push_options
-            )
-            
-            self.notification.show_message(
-                title="推送成功",
-                msg=f"已推送到 {target_branch}",
-                duration=2000
+                *push_options,
+                on_success=on_success,
+                on_error=on_error
             )
             
         except Exception as e:
@@ -0,0 +1,76 @@
+import json
+import os
+import tarfile
+
+# 归档下载的目录中记录来源，之后可以据此转换为 git 仓库
+ARCHIVE_MARKER = ".clut_archive.json"
+
+# Python 3.12 起 tarfile 支持解压过滤器，data 过滤器拒绝指向目标目录之外的链接和特殊文件
+_EXTRACT_KWARGS = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+
+
+class ProgressReader:
+    """包装文件对象，每次读取后回调已读取的字节数"""
+
+    def __init__(self, raw, on_read):
+        self.raw = raw
+        self.on_read = on_read
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        self.on_read(self.bytes_read)
+        return data
+
+
+def _strip_top_dir(name):
+    """去掉 GitHub tarball 顶层的 <owner>-<repo>-<sha>/ 目录"""
+    _, _, rest = name.partition('/')
+    return rest
+
+
+def _check_member_path(name):
+    """拒绝绝对路径和 .. 路径，防止写到目标目录之外"""
+    if os.path.isabs(name) or name.startswith(('/', '\\')):
+        raise Exception(f"归档中包含不安全的路径: {name}")
+    if '..' in name.replace('\\', '/').split('/'):
+        raise Exception(f"归档中包含不安全的路径: {name}")
+
+
+def extract_tarball(fileobj, dest):
+    """从流中边读边解压 GitHub tarball 到 dest，不在内存或磁盘上缓存整个归档
+
+    返回归档对应的提交 (git archive 写在 pax 全局头的 comment 中)，没有时返回 None
+    """
+    os.makedirs(dest, exist_ok=True)
+    # r|gz 为流模式，只能顺序读取，不会 seek
+    with tarfile.open(fileobj=fileobj, mode='r|gz') as tar:
+        for member in tar:
+            name = _strip_top_dir(member.name)
+            if not name:
+                continue
+            _check_member_path(name)
+            member.name = name
+            if member.islnk():
+                member.linkname = _strip_top_dir(member.linkname)
+            tar.extract(member, dest, **_EXTRACT_KWARGS)
+        return tar.pax_headers.get('comment')
+
+
+def write_archive_marker(path, repo_link, ref, commit):
+    with open(os.path.join(path, ARCHIVE_MARKER), 'w', encoding='utf-8') as f:
+        json.dump({'repo_link': repo_link, 'ref': ref, 'commit': commit}, f)
+
+
+def read_archive_marker(path):
+    """读取归档下载的来源信息，不是归档下载的目录时返回 None"""
+    marker = os.path.join(path, ARCHIVE_MARKER)
+    if not os.path.exists(marker):
+        return None
+    try:
+        with open(marker, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"读取归档信息失败: {str(e)}")
+        return None
@@ -0,0 +1,148 @@
+import re
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from PyQt5.QtCore import QObject, pyqtSignal
+from assets.utils.clone_retry import classify_failure
+from assets.utils.rate_limit import BACKGROUND
+
+
+class CircuitOpenError(Exception):
+    """主机处于离线状态，请求没有发出"""
+
+
+def remote_host(link):
+    """远程地址的主机名，支持 https://host/... 和 git@host:path 两种写法，本地路径返回 None"""
+    match = re.match(r'^[\w.-]+@([\w.-]+):', link or "")
+    if match:
+        return match.group(1)
+    return urlparse(link or "").hostname
+
+
+def is_network_error(error):
+    """连接失败或超时类的异常，认证失败、404 等不算"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    stderr = getattr(error, 'stderr', None)
+    return bool(stderr) and classify_failure(str(stderr)) == 'timeout'
+
+
+class CircuitBreaker(QObject):
+    """按主机的熔断器
+
+    同一主机连续 failure_threshold 次连接失败或超时后进入离线状态，之后的 HTTP 请求和
+    git 网络操作直接抛出 CircuitOpenError，不再等待超时。离线期间每隔一段时间放行一个真实请求
+    作为试探(半开状态)，试探成功即恢复在线；间隔从 probe_interval 秒开始逐渐加长，最长 max_probe_interval 秒。
+    没有请求时由后台线程通过共享的 HttpClient 发出 HEAD 请求作为试探，与其他请求使用相同的代理设置。
+    """
+    _instance = None
+    state_changed = pyqtSignal(str, bool)  # (主机, 是否在线)
+
+    @classmethod
+    def get_instance(cls):
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = CircuitBreaker()
+        return cls._instance
+
+    def __init__(self, failure_threshold=3, probe_interval=5, max_probe_interval=60, probe_timeout=3):
+        if CircuitBreaker._instance is not None:
+            raise Exception("CircuitBreaker 是单例类，请使用 get_instance() 方法获取实例")
+        super().__init__()
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._failures = {}  # 主机 -> 连续失败次数
+        self._open = {}  # 离线的主机 -> 下一次允许试探的时间
+        self._intervals = {}  # 离线的主机 -> 当前的试探间隔
+        CircuitBreaker._instance = self
+
+    def is_online(self, host=None):
+        """host 为空时检查是否所有主机都在线"""
+        with self._lock:
+            return not self._open if host is None else host not in self._open
+
+    def offline_hosts(self):
+        with self._lock:
+            return sorted(self._open)
+
+    def check(self, host):
+        """请求前调用，主机离线时立即抛出 CircuitOpenError
+
+        离线但到了试探时间时放行这一次请求，并把下一次试探推迟到下一个间隔之后，
+        试探的结果照常通过 record 记录。
+        """
+        if not host:
+            return
+        with self._lock:
+            retry_at = self._open.get(host)
+            if retry_at is None:
+                return
+            now = time.time()
+            if now >= retry_at:
+                self._open[host] = now + self._intervals[host]
+                self._intervals[host] = min(self.max_probe_interval, self._intervals[host] * 2)
+                return
+        raise CircuitOpenError(f"无法连接 {host}，当前处于离线状态")
+
+    def record(self, host, ok):
+        """记录一次请求的结果"""
+        if not host:
+            return
+        opened = closed = False
+        with self._lock:
+            if ok:
+                self._failures.pop(host, None)
+                self._intervals.pop(host, None)
+                closed = self._open.pop(host, None) is not None
+            else:
+                self._failures[host] = self._failures.get(host, 0) + 1
+                if self._failures[host] >= self.failure_threshold and host not in self._open:
+                    self._open[host] = time.time() + self.probe_interval
+                    self._intervals[host] = self.probe_interval
+                    opened = True
+        if opened:
+            print(f"{host} 连续 {self.failure_threshold} 次连接失败，进入离线状态")
+            threading.Thread(target=self._probe_until_online, args=(host,),
+                             name=f"probe-{host}", daemon=True).start()
+            self.state_changed.emit(host, False)
+        elif closed:
+            print(f"{host} 已恢复连接")
+            self.state_changed.emit(host, True)
+
+    def guard(self, host, fn, *args, is_ok=None, **kwargs):
+        """检查主机状态后执行 fn，按结果记录成功或失败；is_ok(结果) 可以把返回值判定为失败"""
+        self.check(host)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_network_error(e):
+                self.record(host, False)
+            raise
+        self.record(host, is_ok(result) if is_ok else True)
+        return result
+
+    def _probe_until_online(self, host):
+        """离线期间没有其他请求时，到了试探时间就发出一个 HEAD 请求，恢复后结束"""
+        # http_client 导入了本模块，只能在这里导入
+        from assets.utils.http_client import HttpClient
+        http = HttpClient.get_instance()
+        while True:
+            with self._lock:
+                retry_at = self._open.get(host)
+            if retry_at is None:
+                return
+            wait = retry_at - time.time()
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            # 经过 guard，check 放行时作为试探，结果由 guard 记录；
+            # 其他请求已经占用了这次试探时 check 抛出 CircuitOpenError，等下一次
+            try:
+                http.head(f"https://{host}/", priority=BACKGROUND,
+                          timeout=(self.probe_timeout, self.probe_timeout))
+            except Exception:
+                pass
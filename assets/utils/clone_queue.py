@@ -0,0 +1,73 @@
+from collections import deque
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class CloneQueue(QObject):
+    """克隆任务队列
+
+    限制同时运行的克隆线程数量，其余任务排队等待空闲槽位。
+    任务对象只需要提供 start() 方法和 finished 信号。
+    """
+    task_started = pyqtSignal(object)       # 任务开始运行
+    queue_changed = pyqtSignal(int, int)    # (运行中数量, 等待中数量)
+
+    def __init__(self, max_workers=3, parent=None):
+        super().__init__(parent)
+        self._max_workers = max(1, int(max_workers))
+        self._pending = deque()
+        self._running = set()
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    def set_max_workers(self, count):
+        """修改同时运行的任务数，增大时立即启动排队任务"""
+        self._max_workers = max(1, int(count))
+        self._dispatch()
+
+    def enqueue(self, task):
+        """加入队列，有空闲槽位时立即启动"""
+        task.finished.connect(lambda *_, t=task: self._on_task_finished(t))
+        self._pending.append(task)
+        self._dispatch()
+
+    def cancel(self, task):
+        """取消任务: 排队中的直接移出队列，运行中的立即释放槽位
+
+        返回任务是否还没有启动
+        """
+        if task in self._pending:
+            self._pending.remove(task)
+            self.queue_changed.emit(len(self._running), len(self._pending))
+            return True
+        if task in self._running:
+            self._running.discard(task)
+            self._dispatch()
+        return False
+
+    def is_pending(self, task):
+        return task in self._pending
+
+    def is_running(self, task):
+        return task in self._running
+
+    def running_count(self):
+        return len(self._running)
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def _dispatch(self):
+        """按顺序启动排队任务，直到占满槽位"""
+        while self._pending and len(self._running) < self._max_workers:
+            task = self._pending.popleft()
+            self._running.add(task)
+            self.task_started.emit(task)
+            task.start()
+        self.queue_changed.emit(len(self._running), len(self._pending))
+
+    def _on_task_finished(self, task):
+        if task in self._running:
+            self._running.discard(task)
+            self._dispatch()
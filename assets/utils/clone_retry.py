@@ -0,0 +1,80 @@
+import random
+import re
+
+# 失败类型: (显示名称, 是否值得重试)
+FAILURE_KINDS = {
+    'timeout': ("网络超时", True),
+    'early_eof': ("连接提前断开 (early EOF)", True),
+    'rpc_failed': ("RPC 传输失败", True),
+    'auth': ("认证失败", False),
+    'not_found': ("仓库不存在或无权访问", False),
+    'disk': ("磁盘空间不足", False),
+    # 无法识别的错误多半来自参数(如分支名、链接、稀疏检出)或本地文件系统，重试只会重复失败
+    'other': ("未知错误", False),
+}
+
+# 按顺序匹配 stderr，先匹配到的优先
+_FAILURE_PATTERNS = [
+    ('auth', r"Authentication failed|could not read Username|Permission denied \(publickey\)"
+             r"|HTTP Basic: Access denied|returned error: 40[13]"),
+    ('not_found', r"Repository not found|does not appear to be a git repository|returned error: 404"),
+    ('disk', r"No space left on device"),
+    ('rpc_failed', r"RPC failed|curl \d+|HTTP/2 stream|transfer closed with outstanding read data"
+                   r"|gnutls_handshake\(\) failed|GnuTLS recv error|SSL_read|SSL_ERROR_SYSCALL"),
+    ('early_eof', r"early EOF|unexpected disconnect|remote end hung up unexpectedly"
+                  r"|index-pack failed|invalid index-pack output"),
+    ('timeout', r"timed out|Operation too slow|Failed to connect|Could not resolve host"
+                r"|Connection reset|Connection refused"),
+]
+
+# 回退到更省流量的克隆模式
+_CHEAPER_MODE = {
+    'full': 'blobless',
+    'blob_limit': 'blobless',
+    'blobless': 'shallow',
+    'treeless': 'shallow',
+    'shallow': 'shallow',
+}
+
+
+def classify_failure(stderr_text):
+    """根据 git 的错误输出判断失败类型"""
+    for kind, pattern in _FAILURE_PATTERNS:
+        if re.search(pattern, stderr_text, re.IGNORECASE):
+            return kind
+    return 'other'
+
+
+def failure_label(kind):
+    return FAILURE_KINDS.get(kind, FAILURE_KINDS['other'])[0]
+
+
+class RetryPolicy:
+    """克隆失败后的重试策略
+
+    指数退避加随机抖动；第二次重试起改用更便宜的克隆模式，
+    并改为 init + fetch 的方式写入目录，失败后目录保留，下一次直接在其中继续 fetch。
+    """
+
+    def __init__(self, max_attempts=4, base_delay=2.0, factor=2.0, max_delay=60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.factor = factor
+        self.max_delay = max_delay
+
+    def should_retry(self, kind, attempt):
+        """attempt 为已经失败的次数(从 1 开始)"""
+        return FAILURE_KINDS.get(kind, FAILURE_KINDS['other'])[1] and attempt < self.max_attempts
+
+    def delay(self, attempt):
+        """第 attempt 次失败后等待的秒数"""
+        delay = min(self.max_delay, self.base_delay * self.factor ** (attempt - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def plan(self, attempt, mode):
+        """第 attempt 次尝试(从 0 开始)使用的 (克隆模式, 是否用 fetch 续传)"""
+        if attempt <= 1:
+            return mode, False
+        for _ in range(attempt - 1):
+            mode = _CHEAPER_MODE.get(mode, 'shallow')
+        return mode, True
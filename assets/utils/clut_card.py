@@ -7,6 +7,7 @@ class ClutCard(QFrame):
     def __init__(self, title="", msg="", parent=None):
         super().__init__(parent)
         self.setObjectName("clutCard")
+        self.icon_label = None
         self.setup_ui(title, msg)
         self.setup_animations()
         
@@ -51,6 +52,7 @@ class ClutCard(QFrame):
         title_frame.setObjectName("titleFrame")
         title_frame_layout = QHBoxLayout(title_frame)
         title_frame_layout.setContentsMargins(12, 8, 12, 8)
+        self.title_frame_layout = title_frame_layout
         title_frame_layout.addWidget(separator)
         title_frame_layout.addWidget(title_label)
         title_frame_layout.addStretch()
@@ -118,6 +120,14 @@ class ClutCard(QFrame):
         title_frame.setGraphicsEffect(inner_shadow)
         self.setGraphicsEffect(outer_shadow)
         
+    def set_icon(self, pixmap):
+        """在标题前显示图标(如仓库所有者的头像)"""
+        if self.icon_label is None:
+            self.icon_label = QLabel()
+            self.icon_label.setStyleSheet("background: transparent; padding: 0px;")
+            self.title_frame_layout.insertWidget(0, self.icon_label)
+        self.icon_label.setPixmap(pixmap)
+        
     def setup_animations(self):
         # 悬停动画
         self.hover_anim = QPropertyAnimation(self, b"styleSheet")
@@ -37,6 +37,7 @@ class ClutImageCard(QFrame):
         # 添加标题和消息标签作为类属性
         self.title_label = None
         self.msg_label = None
+        self.image_label = None
         
         # 设置最大宽度
         self.setMaximumWidth(800)
@@ -207,9 +208,27 @@ class ClutImageCard(QFrame):
             content.setLayout(content_layout)
             content.resize(image_label.size())
             
+    def set_image(self, image_url):
+        """更换图片，保持当前的显示尺寸"""
+        self.image_url = image_url
+        if not self.image_label:
+            return
+        pixmap = QPixmap(image_url)
+        if pixmap.isNull():
+            print(f"警告: 无法加载图片 {image_url}")
+            return
+        # 已经按显示尺寸缩放好的图片(如图片缓存中的版本)直接显示
+        size = self.image_label.size()
+        fitted = ((pixmap.width() == size.width() and pixmap.height() <= size.height()) or
+                  (pixmap.height() == size.height() and pixmap.width() <= size.width()))
+        if not fitted:
+            pixmap = pixmap.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.image_label.setPixmap(pixmap)
+            
     def _create_image_label(self):
         image_label = ClickableImageLabel()
         image_label.setObjectName("imageLabel")
+        self.image_label = image_label
         
         # 设置大小策略
         image_label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
@@ -0,0 +1,103 @@
+import os
+import signal
+import subprocess
+
+
+class GitProfile:
+    """git 调用配置
+
+    把调优参数以 `git -c key=value` 的形式附加到单次调用上，
+    不再写入用户的 ~/.gitconfig，并发的 git 进程之间也不会互相影响。
+    """
+
+    def __init__(self, config=None, env=None, executable="git"):
+        self.config = dict(config or {})
+        self.env = dict(env or {})
+        self.executable = executable
+
+    def with_config(self, config=None, env=None):
+        """返回合并了额外配置的新 profile，原对象不变"""
+        merged_config = dict(self.config)
+        merged_config.update(config or {})
+        merged_env = dict(self.env)
+        merged_env.update(env or {})
+        return GitProfile(merged_config, merged_env, self.executable)
+
+    def command(self, *args):
+        """生成完整命令行"""
+        cmd = [self.executable]
+        for key, value in self.config.items():
+            cmd += ['-c', f'{key}={value}']
+        cmd += [str(arg) for arg in args]
+        return cmd
+
+    def environ(self):
+        """子进程环境变量"""
+        if not self.env:
+            return None
+        env = os.environ.copy()
+        env.update(self.env)
+        return env
+
+    def run(self, *args, **kwargs):
+        """subprocess.run 的封装"""
+        kwargs.setdefault('env', self.environ())
+        return subprocess.run(self.command(*args), **kwargs)
+
+    def popen(self, *args, **kwargs):
+        """subprocess.Popen 的封装"""
+        kwargs.setdefault('env', self.environ())
+        return subprocess.Popen(self.command(*args), **kwargs)
+
+
+# 全局默认配置，所有 git 子进程都从这里派生
+DEFAULT_PROFILE = GitProfile()
+
+def checkout_workers():
+    """并行检出的进程数，按 CPU 核心数自动设置"""
+    return os.cpu_count() or 1
+
+
+# 克隆/拉取使用的传输参数，固定英文输出以便解析进度
+CLONE_PROFILE = DEFAULT_PROFILE.with_config(
+    config={
+        # 并行检出(git 2.32+)，文件数超过阈值时用多个进程写入工作区
+        'checkout.workers': str(checkout_workers()),
+        'checkout.thresholdForParallelism': '100',
+        # 增加缓冲区大小
+        'http.postBuffer': '524288000',
+        # 低速超时: 300 秒内低于 1000 B/s 才判定失败
+        'http.lowSpeedLimit': '1000',
+        'http.lowSpeedTime': '300',
+    },
+    env={'LC_ALL': 'C'}
+)
+
+
+def process_group_kwargs():
+    """让子进程成为新进程组的组长，便于连同 git-remote-https / index-pack 等子进程一起结束"""
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def terminate_process_tree(process, force=False):
+    """结束进程组中的所有进程，不等待退出
+
+    进程需要用 process_group_kwargs() 启动。force 为 False 时先发送 SIGTERM，
+    让 git 有机会清理临时 pack 文件。
+    """
+    if process.poll() is not None:
+        return
+    if os.name == 'nt':
+        # Windows 没有进程组信号，taskkill /T 结束整个进程树
+        subprocess.Popen(
+            ['taskkill', '/T', '/F', '/PID', str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+    except ProcessLookupError:
+        pass
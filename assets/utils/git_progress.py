@@ -0,0 +1,200 @@
+import re
+import time
+
+# git 各阶段在整体进度中占的区间 (起始百分比, 结束百分比)
+PHASE_WEIGHTS = {
+    "Enumerating objects": (0, 0),
+    "Counting objects": (0, 5),
+    "Compressing objects": (5, 10),
+    "Receiving objects": (10, 75),
+    "Resolving deltas": (75, 90),
+    "Updating files": (90, 100),
+    "Checking out files": (90, 100),
+}
+
+# git 各阶段归入的耗时分类: 网络传输 / 索引 pack (index-pack) / 检出文件
+PHASE_GROUPS = {
+    "Enumerating objects": "network",
+    "Counting objects": "network",
+    "Compressing objects": "network",
+    "Receiving objects": "network",
+    "Resolving deltas": "index-pack",
+    "Updating files": "checkout",
+    "Checking out files": "checkout",
+}
+
+_UNITS = {
+    "bytes": 1,
+    "KiB": 1024,
+    "MiB": 1024 ** 2,
+    "GiB": 1024 ** 3,
+    "TiB": 1024 ** 4,
+}
+
+# 例: "remote: Compressing objects:  45% (450/1000)"
+#     "Receiving objects:  45% (450/1000), 1.20 MiB | 2.00 MiB/s"
+_PROGRESS_RE = re.compile(
+    r"^(?:remote:\s*)?(?P<phase>[A-Za-z][A-Za-z ]*?):\s+"
+    r"(?P<percent>\d+)%\s+\((?P<current>\d+)/(?P<total>\d+)\)"
+    r"(?:,\s+(?P<size>[\d.]+)\s+(?P<size_unit>bytes|[KMGT]iB)"
+    r"(?:\s+\|\s+(?P<rate>[\d.]+)\s+(?P<rate_unit>bytes|[KMGT]iB)/s)?)?"
+)
+
+
+def format_size(num_bytes):
+    """格式化字节数"""
+    if num_bytes < 1024:
+        return f"{int(num_bytes)} B"
+    elif num_bytes < 1024 * 1024:
+        return f"{num_bytes/1024:.1f} KB"
+    elif num_bytes < 1024 * 1024 * 1024:
+        return f"{num_bytes/1024/1024:.1f} MB"
+    return f"{num_bytes/1024/1024/1024:.2f} GB"
+
+
+def format_eta(seconds):
+    """格式化剩余时间"""
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class GitProgressParser:
+    """解析 git --progress 的 stderr 输出
+
+    git 用回车符刷新同一行的进度，feed() 接收任意切分的文本块，
+    按 \\r / \\n 切成完整的行，并对进度行计算整体百分比、已接收字节、
+    平滑后的速度以及当前阶段的剩余时间。
+    """
+
+    def __init__(self, smoothing=0.3, clock=time.monotonic):
+        self._smoothing = smoothing
+        self._clock = clock
+        self._buffer = ""
+        self.phase = None
+        self.received_bytes = 0
+        self.speed = 0.0        # 字节/秒，指数平滑
+        self._item_rate = 0.0   # 当前阶段 对象/秒，指数平滑
+        self._last_sample = None  # (时间, 字节数, 对象数)
+
+    def feed(self, text):
+        """输入一段输出，返回 [(行文本, 进度信息或None), ...]"""
+        self._buffer += text
+        parts = re.split(r"[\r\n]", self._buffer)
+        self._buffer = parts.pop()
+        return [(line.strip(), self.parse_line(line)) for line in parts if line.strip()]
+
+    def flush(self):
+        """处理缓冲区中剩余的不完整行"""
+        line, self._buffer = self._buffer.strip(), ""
+        if not line:
+            return []
+        return [(line, self.parse_line(line))]
+
+    def parse_line(self, line):
+        """解析单行进度，非进度行返回 None"""
+        match = _PROGRESS_RE.match(line.strip())
+        if not match:
+            return None
+
+        phase = match.group("phase").strip()
+        current = int(match.group("current"))
+        total = int(match.group("total"))
+        phase_percent = int(match.group("percent"))
+        now = self._clock()
+
+        if match.group("size"):
+            self.received_bytes = int(float(match.group("size")) * _UNITS[match.group("size_unit")])
+
+        if phase != self.phase:
+            self.phase = phase
+            self._item_rate = 0.0
+            self._last_sample = (now, self.received_bytes, current)
+
+        self._update_rates(now, current)
+
+        start, end = PHASE_WEIGHTS.get(phase, (0, 0))
+        if end > start:
+            overall = start + (end - start) * phase_percent / 100
+        else:
+            overall = start
+
+        return {
+            "phase": phase,
+            "phase_percent": phase_percent,
+            "current": current,
+            "total": total,
+            "percent": int(overall),
+            "bytes": self.received_bytes,
+            "speed": self.speed,
+            "eta": self._estimate_eta(phase, current, total),
+        }
+
+    def _update_rates(self, now, current):
+        last_time, last_bytes, last_current = self._last_sample
+        elapsed = now - last_time
+        # 采样间隔太短时速度抖动很大，累积到 0.5 秒再更新
+        if elapsed < 0.5:
+            return
+        byte_rate = max(0, self.received_bytes - last_bytes) / elapsed
+        item_rate = max(0, current - last_current) / elapsed
+        a = self._smoothing
+        self.speed = byte_rate if self.speed == 0 else a * byte_rate + (1 - a) * self.speed
+        self._item_rate = item_rate if self._item_rate == 0 else a * item_rate + (1 - a) * self._item_rate
+        self._last_sample = (now, self.received_bytes, current)
+
+    def _estimate_eta(self, phase, current, total):
+        """估算当前阶段剩余秒数，数据不足时返回 None"""
+        if current >= total:
+            return 0
+        if phase == "Receiving objects" and self.received_bytes and current and self.speed > 0:
+            expected_bytes = self.received_bytes * total / current
+            return (expected_bytes - self.received_bytes) / self.speed
+        if self._item_rate > 0:
+            return (total - current) / self._item_rate
+        return None
+
+
+class TransferMeter:
+    """统计 HTTP 下载等非 git 传输的进度
+
+    输出与 GitProgressParser 相同格式的进度信息，进度卡片和进度对话框可以直接使用。
+    total 未知(为 0)时百分比保持为 0，剩余时间为 None。
+    """
+
+    def __init__(self, total=0, phase="Downloading", smoothing=0.3, clock=time.monotonic):
+        self.total = total
+        self.phase = phase
+        self.speed = 0.0
+        self._smoothing = smoothing
+        self._clock = clock
+        self._last_sample = (clock(), 0)
+
+    def update(self, received):
+        """更新已接收的字节数，返回进度信息"""
+        now = self._clock()
+        last_time, last_bytes = self._last_sample
+        elapsed = now - last_time
+        if elapsed >= 0.5:
+            rate = max(0, received - last_bytes) / elapsed
+            a = self._smoothing
+            self.speed = rate if self.speed == 0 else a * rate + (1 - a) * self.speed
+            self._last_sample = (now, received)
+
+        percent = int(received / self.total * 100) if self.total else 0
+        eta = None
+        if self.total and self.speed > 0:
+            eta = max(0, self.total - received) / self.speed
+        return {
+            "phase": self.phase,
+            "phase_percent": percent,
+            "current": received,
+            "total": self.total,
+            "percent": min(percent, 100),
+            "bytes": received,
+            "speed": self.speed,
+            "eta": eta,
+        }
@@ -0,0 +1,169 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from assets.utils.http_client import HttpClient
+from assets.utils.image_cache import load_card_icons
+from assets.utils.network_worker import NetworkWorker
+from assets.utils.rate_limit import BACKGROUND
+from assets.utils.session_snapshot import SessionSnapshot, trim_repo
+
+API_ROOT = "https://api.github.com"
+
+# 会改变仓库列表内容或排序的事件
+WATCHED_EVENTS = ('PushEvent', 'CreateEvent', 'DeleteEvent')
+
+# 响应中没有 X-Poll-Interval 时的轮询间隔(秒)
+DEFAULT_POLL_INTERVAL = 60
+
+
+def apply_repo_changes(repos, updated, removed):
+    """把有变化的仓库移到列表最前面(列表按更新时间排序)，删除已不存在的仓库"""
+    changed = [trim_repo(repo) for repo in updated]
+    dropped = set(removed) | {repo['html_url'] for repo in changed}
+    return changed + [repo for repo in repos if repo['html_url'] not in dropped]
+
+
+class RepoEventWatcher(QObject):
+    """通过事件 API 发现仓库变化
+
+    按 GitHub 在 X-Poll-Interval 中建议的间隔请求用户的事件列表，请求带有 ETag，
+    没有新事件时服务器返回 304，不计入速率限制。出现推送、创建或删除事件时，
+    只重新获取涉及的仓库，并更新会话快照中的仓库列表，页面据此替换对应的卡片，
+    不必重新下载整个仓库列表。
+    """
+    _instance = None
+    repos_updated = pyqtSignal(str, list)  # (用户名, 有变化的仓库)
+    repos_removed = pyqtSignal(str, list)  # (用户名, 已不存在的仓库 html_url)
+
+    @classmethod
+    def get_instance(cls):
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = RepoEventWatcher()
+        return cls._instance
+
+    def __init__(self, http=None):
+        if RepoEventWatcher._instance is not None:
+            raise Exception("RepoEventWatcher 是单例类，请使用 get_instance() 方法获取实例")
+        super().__init__()
+        self.http = http or HttpClient.get_instance()
+        self.network = NetworkWorker.get_instance()
+        self.snapshot = SessionSnapshot.get_instance()
+        self.username = None
+        self.token = None
+        self.last_event_id = None  # 已经处理过的最新事件
+        self.interval = DEFAULT_POLL_INTERVAL
+        self._generation = 0  # 每次 start/stop 加一，丢弃之前发出的请求的结果
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.poll)
+        RepoEventWatcher._instance = self
+
+    def start(self, username, token):
+        """开始监视该用户，第一次请求只记录当前最新的事件"""
+        if (username, token) == (self.username, self.token):
+            return
+        self.stop()
+        self.username = username
+        self.token = token
+        self.poll()
+
+    def stop(self):
+        self._generation += 1
+        self.timer.stop()
+        self.username = None
+        self.token = None
+        self.last_event_id = None
+
+    def poll(self):
+        if not self.username:
+            return
+        generation = self._generation
+        self.network.submit(
+            self._check, self.username, self.token, self.last_event_id,
+            on_success=lambda result: self._on_checked(generation, result),
+            on_error=lambda error: self._on_failed(generation, error)
+        )
+
+    def _check(self, username, token, last_event_id):
+        """请求事件列表并重新获取涉及的仓库，在后台线程中调用
+
+        返回 (轮询间隔, 最新事件 id, 有变化的仓库, 已不存在的仓库 html_url)
+        """
+        response = self.http.get(f"{API_ROOT}/users/{username}/events", params={'per_page': 30},
+                                 token=token, priority=BACKGROUND)
+        interval = int(response.headers.get('X-Poll-Interval', DEFAULT_POLL_INTERVAL))
+        if response.status_code != 200:
+            raise Exception(f"获取事件失败: {response.status_code}")
+        events = response.json()
+        newest = events[0]['id'] if events else last_event_id
+        if last_event_id is None or response.from_cache:
+            return interval, newest, [], []
+
+        names = []
+        for event in events:
+            if int(event['id']) <= int(last_event_id):
+                break
+            name = event['repo']['name']
+            if event['type'] in WATCHED_EVENTS and name not in names:
+                names.append(name)
+
+        updated, removed = [], []
+        for name in names:
+            repo_response = self.http.get(f"{API_ROOT}/repos/{name}", token=token, priority=BACKGROUND)
+            if repo_response.status_code == 200:
+                updated.append(repo_response.json())
+            elif repo_response.status_code == 404:
+                removed.append(f"https://github.com/{name}")
+        return interval, newest, updated, removed
+
+    def _on_checked(self, generation, result):
+        if generation != self._generation:
+            return
+        self.interval, self.last_event_id, updated, removed = result
+        if updated or removed:
+            repos, _ = self.snapshot.get('repos', owner=self.username)
+            if repos is not None:
+                self.snapshot.put('repos', apply_repo_changes(repos, updated, removed), owner=self.username)
+            if updated:
+                self.repos_updated.emit(self.username, updated)
+            if removed:
+                self.repos_removed.emit(self.username, removed)
+        self.timer.start(self.interval * 1000)
+
+    def _on_failed(self, generation, error):
+        if generation != self._generation:
+            return
+        print(f"检查仓库事件失败: {error}")
+        self.timer.start(self.interval * 1000)
+
+
+def follow_repo_events(page, owner):
+    """页面的仓库卡片列表跟随 RepoEventWatcher 更新
+
+    owner() 返回页面当前显示的是谁的仓库列表。页面需要有 repo_list_thread、loaded_repos，
+    以及两个只处理界面的方法：replace_repo_card(仓库, avatar_cards) 移除旧卡片并在最前面插入新卡片，
+    remove_repo_card(html_url) 移除卡片。列表数据的合并和头像加载在这里统一处理。
+    """
+    def can_apply(username):
+        # 正在重新获取整个列表时以完整结果为准
+        running = page.repo_list_thread is not None and page.repo_list_thread.isRunning()
+        return owner() == username and not running
+
+    def on_updated(username, repos):
+        if not can_apply(username):
+            return
+        avatar_cards = {}
+        for repo in reversed(repos):
+            page.replace_repo_card(repo, avatar_cards)
+        load_card_icons(avatar_cards)
+        page.loaded_repos = apply_repo_changes(page.loaded_repos, repos, [])
+
+    def on_removed(username, repo_urls):
+        if not can_apply(username):
+            return
+        for repo_url in repo_urls:
+            page.remove_repo_card(repo_url)
+        page.loaded_repos = apply_repo_changes(page.loaded_repos, [], repo_urls)
+
+    watcher = RepoEventWatcher.get_instance()
+    watcher.repos_updated.connect(on_updated)
+    watcher.repos_removed.connect(on_removed)
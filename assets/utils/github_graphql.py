@@ -0,0 +1,133 @@
+import math
+from assets.utils.http_client import HttpClient
+from assets.utils.image_cache import AVATAR_CARD_SIZE, AVATAR_LIST_SIZE
+from assets.utils.rate_limit import INTERACTIVE
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# 只请求卡片上实际显示的字段；头像直接请求显示所需的尺寸
+REPOS_FIELD = f"""
+    repositories(first: $first, after: $after,
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 orderBy: {{field: UPDATED_AT, direction: DESC}}) {{
+      totalCount
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{
+        name
+        description
+        url
+        stargazerCount
+        primaryLanguage {{ name }}
+        owner {{ avatarUrl(size: {AVATAR_LIST_SIZE}) }}
+      }}
+    }}
+"""
+
+PROFILE_QUERY = f"""
+query($first: Int!, $after: String) {{
+  viewer {{
+    login
+    name
+    email
+    location
+    websiteUrl
+    createdAt
+    avatarUrl(size: {AVATAR_CARD_SIZE})
+    followers {{ totalCount }}
+    following {{ totalCount }}
+    publicRepos: repositories(privacy: PUBLIC, ownerAffiliations: [OWNER]) {{ totalCount }}
+    organizations(first: 100) {{ nodes {{ login }} }}
+    {REPOS_FIELD}
+  }}
+}}
+"""
+
+REPOS_QUERY = f"""
+query($first: Int!, $after: String) {{
+  viewer {{
+    {REPOS_FIELD}
+  }}
+}}
+"""
+
+
+def repo_from_node(node):
+    """转换为与 REST API 相同的字段，仓库卡片不需要区分数据来源"""
+    return {
+        'name': node['name'],
+        'description': node['description'],
+        'language': (node['primaryLanguage'] or {}).get('name'),
+        'stargazers_count': node['stargazerCount'],
+        'html_url': node['url'],
+        'clone_url': f"{node['url']}.git",
+        'owner': {'avatar_url': node['owner']['avatarUrl']},
+    }
+
+
+def profile_from_viewer(viewer):
+    """转换为 verify_git_credentials 返回的用户信息格式"""
+    return {
+        'username': viewer['login'],
+        'name': viewer['name'],
+        'email': viewer['email'],
+        'avatar_url': viewer['avatarUrl'],
+        'location': viewer['location'],
+        'blog': viewer['websiteUrl'],
+        'public_repos': viewer['publicRepos']['totalCount'],
+        'followers': viewer['followers']['totalCount'],
+        'following': viewer['following']['totalCount'],
+        'created_at': viewer['createdAt'],
+        'organizations': [org['login'] for org in viewer['organizations']['nodes']],
+    }
+
+
+class GraphQLRepoClient:
+    """通过 GraphQL 获取登录用户的资料和仓库列表
+
+    第一次查询同时返回用户资料、所在组织和第一页仓库，登录后不必再分别请求
+    /user 和 /user/repos。与 RepoListClient 提供相同的 iter_pages 接口，
+    之后的页按游标依次请求。需要 token，只能查询 token 所属的用户。
+    """
+
+    def __init__(self, token, per_page=100, http=None, priority=INTERACTIVE):
+        self.token = token
+        self.per_page = per_page
+        self.priority = priority
+        self.http = http or HttpClient.get_instance()
+        self.profile = None
+        self._first_page = None  # fetch_profile 一起取回的第一页仓库
+
+    def _query(self, query, after=None):
+        response = self.http.post(
+            GRAPHQL_URL,
+            json={'query': query, 'variables': {'first': self.per_page, 'after': after}},
+            token=self.token,
+            priority=self.priority
+        )
+        if response.status_code != 200:
+            raise Exception(f"GraphQL 请求失败: {response.status_code}")
+        data = response.json()
+        if data.get('errors'):
+            raise Exception(f"GraphQL 查询出错: {data['errors'][0].get('message')}")
+        return data['data']['viewer']
+
+    def fetch_profile(self):
+        """获取用户资料，第一页仓库保留给之后的 iter_pages"""
+        viewer = self._query(PROFILE_QUERY)
+        self.profile = profile_from_viewer(viewer)
+        self._first_page = viewer['repositories']
+        return self.profile
+
+    def iter_pages(self):
+        """按顺序逐页返回 (页码, 总页数, 仓库列表)"""
+        # 第一页与登录时的查询完全相同，同时进行时由 HttpClient 合并为一次请求
+        repos = self._first_page or self._query(PROFILE_QUERY)['repositories']
+        self._first_page = None
+        pages = max(1, math.ceil(repos['totalCount'] / self.per_page))
+        page = 1
+        while True:
+            yield page, pages, [repo_from_node(node) for node in repos['nodes']]
+            if not repos['pageInfo']['hasNextPage']:
+                return
+            page += 1
+            repos = self._query(REPOS_QUERY, after=repos['pageInfo']['endCursor'])['repositories']
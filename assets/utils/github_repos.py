@@ -0,0 +1,132 @@
+import re
+from assets.utils.http_client import HttpClient
+from assets.utils.github_graphql import GraphQLRepoClient
+from assets.utils.rate_limit import INTERACTIVE
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QThread, pyqtSignal
+
+API_ROOT = "https://api.github.com"
+
+# 登录后列出的仓库: 自己的、协作的、所在组织的
+DEFAULT_AFFILIATION = "owner,collaborator,organization_member"
+
+
+def parse_link_header(value):
+    """解析分页的 Link 响应头，返回 {rel: url}"""
+    links = {}
+    for url, rel in re.findall(r'<([^>]+)>\s*;\s*rel="([^"]+)"', value or ""):
+        links[rel] = url
+    return links
+
+
+def last_page(response):
+    """从 Link 头中读取总页数，只有一页时返回 1"""
+    last = parse_link_header(response.headers.get('Link')).get('last')
+    if not last:
+        return 1
+    match = re.search(r'[?&]page=(\d+)', last)
+    return int(match.group(1)) if match else 1
+
+
+class RepoListClient:
+    """分页获取仓库列表
+
+    每页 100 个，先请求第一页并从 Link 头得到总页数，其余页用有限的线程池并发请求。
+    有 token 时使用 /user/repos，包含私有仓库和组织仓库；否则只能列出用户的公开仓库。
+    """
+
+    def __init__(self, username=None, token=None, per_page=100, max_workers=4,
+                 affiliation=DEFAULT_AFFILIATION, http=None, priority=INTERACTIVE):
+        self.username = username
+        self.priority = priority  # 后台预取时配额不足会等待，而不是失败
+        self.token = token
+        self.per_page = per_page
+        self.max_workers = max_workers
+        self.affiliation = affiliation
+        # 共享的长连接客户端，带条件请求缓存，列表没有变化的页直接使用缓存
+        self.http = http or HttpClient.get_instance()
+
+    def _endpoint(self):
+        if self.token:
+            return f"{API_ROOT}/user/repos", {'affiliation': self.affiliation, 'sort': 'updated'}
+        return f"{API_ROOT}/users/{self.username}/repos", {'type': 'owner', 'sort': 'updated'}
+
+    def _get_page(self, page):
+        url, params = self._endpoint()
+        params.update({'per_page': self.per_page, 'page': page})
+        response = self.http.get(url, params=params, token=self.token, priority=self.priority)
+        if response.status_code != 200:
+            raise Exception(f"API 请求失败: {response.status_code}")
+        return response
+
+    def iter_pages(self):
+        """按页码顺序逐页返回 (页码, 总页数, 仓库列表)，后面的页在后台并发请求"""
+        first = self._get_page(1)
+        pages = last_page(first)
+        yield 1, pages, first.json()
+        if pages == 1:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._get_page, page) for page in range(2, pages + 1)]
+            # 按顺序等待，先返回的页已在后台下载完成，整体耗时取决于最慢的一页
+            for page, future in enumerate(futures, start=2):
+                yield page, pages, future.result().json()
+
+
+class RepoListThread(QThread):
+    """在后台获取仓库列表，每获取到一页就通过 page_loaded 发出
+
+    use_graphql 为 True 且有 token 时通过 GraphQL 获取，失败时改用 REST API；
+    client 可以传入已经取回第一页的 GraphQLRepoClient(如登录时的查询)，第一页不再请求。
+    """
+    status = pyqtSignal(str)
+    page_loaded = pyqtSignal(list)  # 一页仓库
+    finished = pyqtSignal(bool, str)  # (成功/失败, 消息)
+
+    def __init__(self, username=None, token=None, http=None, priority=INTERACTIVE, parent=None,
+                 use_graphql=False, client=None):
+        super().__init__(parent)
+        self.username = username
+        self.token = token
+        self.http = http
+        self.priority = priority
+        self.use_graphql = use_graphql
+        self.client = client
+        self.loaded_pages = 0
+
+    def _rest_client(self):
+        return RepoListClient(username=self.username, token=self.token, http=self.http,
+                              priority=self.priority)
+
+    def run(self):
+        client = self.client
+        if client is None and self.use_graphql and self.token:
+            client = GraphQLRepoClient(self.token, http=self.http, priority=self.priority)
+        if client is None:
+            client = self._rest_client()
+        try:
+            self.status.emit("正在获取仓库列表...")
+            count = self._load(client)
+        except Exception as e:
+            if not isinstance(client, GraphQLRepoClient) or self.loaded_pages:
+                self.finished.emit(False, str(e))
+                return
+            # GraphQL 不可用(如 token 权限不足)时改用 REST API
+            print(f"GraphQL 获取仓库列表失败，改用 REST API: {str(e)}")
+            try:
+                count = self._load(self._rest_client())
+            except Exception as e:
+                self.finished.emit(False, str(e))
+                return
+        self.finished.emit(True, f"共 {count} 个仓库")
+
+    def _load(self, client):
+        self.loaded_pages = 0
+        count = 0
+        for page, pages, repos in client.iter_pages():
+            count += len(repos)
+            self.loaded_pages += 1
+            self.page_loaded.emit(repos)
+            self.status.emit(f"已加载 {page}/{pages} 页")
+        return count
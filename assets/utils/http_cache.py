@@ -0,0 +1,118 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# 这些响应头描述的是原始传输，缓存中保存的是解码后的内容，不再适用
+_TRANSPORT_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class HttpCache:
+    """GET 响应的磁盘缓存
+
+    每个条目保存响应内容、响应头以及 ETag / Last-Modified 校验值，
+    按 URL(含查询参数) 和所用的 token 区分，不同账户之间不会共用缓存。
+    """
+
+    def __init__(self, cache_dir="cache/http"):
+        self.cache_dir = cache_dir
+
+    def key(self, url, authorization=None):
+        digest = hashlib.sha256(url.encode('utf-8'))
+        if authorization:
+            digest.update(b'\0' + authorization.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"读取 HTTP 缓存失败: {str(e)}")
+            return None
+
+    def store(self, key, response):
+        """保存带有校验值的 200 响应"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        entry = {
+            'url': response.url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in _TRANSPORT_HEADERS},
+            'body': base64.b64encode(response.content).decode('ascii'),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 先写临时文件再替换，并发请求同一 URL 时不会读到写了一半的条目
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            print(f"写入 HTTP 缓存失败: {str(e)}")
+
+    def build_response(self, entry, not_modified):
+        """用缓存内容和 304 响应中的最新响应头(如剩余配额)构造 200 响应"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response._content = base64.b64decode(entry['body'])
+        response.encoding = entry.get('encoding')
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        for name, value in not_modified.headers.items():
+            if name.lower() not in _TRANSPORT_HEADERS:
+                response.headers[name] = value
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.from_cache = True
+        return response
+
+
+class CachedSession(requests.Session):
+    """带条件请求的 Session
+
+    GET 请求会附带缓存中的 If-None-Match / If-Modified-Since，
+    服务器返回 304 时直接使用缓存内容；GitHub 的 304 响应不计入主速率限制。
+    stream=True 的请求(如下载归档)和 use_cache=False 的请求不经过缓存。
+    """
+
+    def __init__(self, cache=None):
+        super().__init__()
+        self.cache = cache or HttpCache()
+
+    def request(self, method, url, use_cache=True, **kwargs):
+        if method.upper() != 'GET' or kwargs.get('stream') or not use_cache:
+            return super().request(method, url, **kwargs)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        full_url = requests.Request('GET', url, params=kwargs.get('params')).prepare().url
+        authorization = headers.get('Authorization') or self.headers.get('Authorization')
+        key = self.cache.key(full_url, authorization)
+        entry = self.cache.get(key)
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().request(method, url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry:
+            return self.cache.build_response(entry, response)
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        response.from_cache = False
+        return response
@@ -0,0 +1,118 @@
+import json
+import requests
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from assets.utils.http_cache import CachedSession
+from assets.utils.rate_limit import RateLimiter, INTERACTIVE, BACKGROUND, token_key
+from assets.utils.single_flight import SingleFlight
+from assets.utils.circuit_breaker import CircuitBreaker
+
+API_HOST = "api.github.com"
+
+
+class HttpClient(CachedSession):
+    """全局共享的 HTTP 客户端
+
+    按主机保持长连接池，所有页面和线程复用同一组连接，不必每次请求都重新握手。
+    统一设置超时和 GitHub API 的请求头；token 只附加到 api.github.com 的请求上，
+    不会发给头像、归档下载等其他主机。API 请求经过 RateLimiter 按剩余配额调度。
+    所有请求经过 CircuitBreaker，主机离线时立即失败；连接超时比读取超时短，断网时尽快发现。
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = HttpClient()
+        return cls._instance
+
+    def __init__(self, timeout=(5, 10), pool_size=16, cache=None):
+        if HttpClient._instance is not None:
+            raise Exception("HttpClient 是单例类，请使用 get_instance() 方法获取实例")
+        super().__init__(cache)
+        self.timeout = timeout
+        self.token = None
+        self.rate_limiter = RateLimiter()
+        self.flights = SingleFlight(ttl=5)
+        self.breaker = CircuitBreaker.get_instance()
+        # 每个主机一个连接池，pool_size 需要覆盖同时进行的请求数(如并发的分页请求)
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        HttpClient._instance = self
+
+    def set_token(self, token):
+        """设置默认的 GitHub token，登出时传入 None"""
+        self.token = token or None
+
+    def request(self, method, url, token=None, priority=INTERACTIVE, max_deferrals=3, **kwargs):
+        """token 为空时使用 set_token 设置的默认 token
+
+        priority 为 BACKGROUND 的请求在配额不足或被限流时等待配额恢复后再发出，
+        最多推迟 max_deferrals 次。相同的 GET 请求(以及 GraphQL 查询)并发时只发出一次，
+        调用方共享同一个响应，成功的响应在内存中保留几秒，不论优先级；
+        只是用户请求不会等待可能正在等配额的后台请求，而是自己发出。
+        """
+        token = token or self.token
+        key = self._flight_key(method, url, token, kwargs)
+        send = lambda: _share_json(self._send(method, url, token, priority, max_deferrals, **kwargs))
+        if key is None:
+            return send()
+        return self.flights.do(key, send, cacheable=lambda response: response.status_code == 200,
+                               urgent=priority != BACKGROUND)
+
+    def _flight_key(self, method, url, token, kwargs):
+        """可以合并的请求返回 (方法, 完整 URL, token 摘要, 请求体, 请求头)，否则返回 None"""
+        method = method.upper()
+        if kwargs.get('stream'):
+            return None
+        if method == 'GET':
+            body = None
+        elif method == 'POST' and urlparse(url).path == '/graphql':
+            body = json.dumps(kwargs.get('json'), sort_keys=True)
+        else:
+            return None
+        full_url = requests.Request('GET', url, params=kwargs.get('params')).prepare().url
+        headers = tuple(sorted((kwargs.get('headers') or {}).items()))
+        return method, full_url, token_key(token), body, headers
+
+    def _send(self, method, url, token, priority, max_deferrals, **kwargs):
+        # 网关错误也说明主机暂时不可用
+        return self.breaker.guard(
+            urlparse(url).hostname, self._send_now, method, url, token, priority, max_deferrals,
+            is_ok=lambda response: response.status_code not in (502, 503, 504), **kwargs
+        )
+
+    def _send_now(self, method, url, token, priority, max_deferrals, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if urlparse(url).hostname != API_HOST:
+            return super().request(method, url, headers=headers, **kwargs)
+
+        headers.setdefault('Accept', 'application/vnd.github.v3+json')
+        if token:
+            headers.setdefault('Authorization', f'token {token}')
+        # GraphQL 按查询的点数单独限流
+        resource = 'graphql' if urlparse(url).path == '/graphql' else 'core'
+        for _ in range(max_deferrals + 1):
+            self.rate_limiter.acquire(token, priority, resource)
+            response = super().request(method, url, headers=headers, **kwargs)
+            limited = self.rate_limiter.update(token, response, resource)
+            if not (limited and priority == BACKGROUND):
+                break
+        return response
+
+
+def _share_json(response):
+    """共享的响应只解析一次 JSON，所有调用方拿到同一个对象，不要修改它"""
+    parse = response.json
+    parsed = []
+
+    def shared_json(**kwargs):
+        if not parsed:
+            parsed.append(parse(**kwargs))
+        return parsed[0]
+
+    response.json = shared_json
+    return response
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+from assets.utils.http_client import HttpClient
+from assets.utils.network_worker import NetworkWorker
+
+# 各处实际使用的头像尺寸(像素)，缓存中按这些尺寸预先缩放好
+AVATAR_CARD_SIZE = 120  # 账户页的用户信息卡片
+AVATAR_LIST_SIZE = 32  # 仓库列表中的所有者头像
+
+
+class ImageCache:
+    """按内容寻址的图片缓存
+
+    原图按内容的 sha256 保存，不同 URL 下载到相同的图片只保存一份；
+    每张原图按需生成固定尺寸的缩放版本，界面直接加载，不必每次解码原图再平滑缩放。
+    URL 到内容摘要的映射记录 ETag / Last-Modified，超过 revalidate_after 秒后用条件请求重新验证，
+    图片没有变化时服务器返回 304，不重新下载。
+    总大小超过 max_bytes 时按最近使用时间淘汰整组(原图和所有缩放版本)。
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = ImageCache()
+        return cls._instance
+
+    def __init__(self, cache_dir="cache/images", max_bytes=50 * 1024 * 1024,
+                 revalidate_after=24 * 3600, http=None):
+        if ImageCache._instance is not None:
+            raise Exception("ImageCache 是单例类，请使用 get_instance() 方法获取实例")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.http = http or HttpClient.get_instance()
+        self._lock = threading.Lock()
+        self._url_locks = {}  # 同一 URL 同时只下载一次
+        self._index = self._load_index()
+        ImageCache._instance = self
+
+    # ---------- 索引 ----------
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            # urls: url -> {hash, etag, last_modified, checked}
+            # blobs: hash -> {size, used}，size 包含所有缩放版本
+            return {'urls': index.get('urls', {}), 'blobs': index.get('blobs', {})}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"读取图片缓存索引失败: {str(e)}")
+        return {'urls': {}, 'blobs': {}}
+
+    def _save_index(self):
+        """在持有 self._lock 时调用"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self._index_path())
+        except Exception as e:
+            print(f"写入图片缓存索引失败: {str(e)}")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest)
+
+    def _variant_path(self, digest, size):
+        return os.path.join(self.cache_dir, "variants", f"{digest}_{size}.png")
+
+    # ---------- 读取 ----------
+
+    def cached_path(self, url, size):
+        """已缓存的缩放版本路径，不发起网络请求，可以在界面线程中调用；没有缓存时返回 None"""
+        with self._lock:
+            entry = self._index['urls'].get(url)
+            if not entry:
+                return None
+            path = self._variant_path(entry['hash'], size)
+            if not os.path.exists(path):
+                return None
+            blob = self._index['blobs'].get(entry['hash'])
+            if blob:
+                blob['used'] = time.time()
+            return path
+
+    def fetch(self, url, size):
+        """返回指定尺寸的本地图片路径，必要时下载或重新验证，在后台线程中调用"""
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            entry = self._index['urls'].get(url)
+            if not entry or time.time() - entry.get('checked', 0) > self.revalidate_after:
+                entry = self._revalidate(url, entry)
+            return self._ensure_variant(entry['hash'], size)
+
+    def _revalidate(self, url, entry):
+        """下载图片或用条件请求确认缓存仍然有效，返回最新的索引条目"""
+        headers = {}
+        if entry and os.path.exists(self._blob_path(entry['hash'])):
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        else:
+            entry = None
+
+        try:
+            # 图片单独按内容保存，不再经过 HTTP 响应缓存
+            response = self.http.get(url, headers=headers, use_cache=False)
+        except Exception:
+            if entry:  # 网络不可用时继续使用旧图片
+                return entry
+            raise
+
+        if response.status_code == 304 and entry:
+            entry = dict(entry, checked=time.time())
+        elif response.status_code == 200:
+            content = response.content
+            digest = hashlib.sha256(content).hexdigest()
+            blob_path = self._blob_path(digest)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, blob_path)
+            entry = {
+                'hash': digest,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'checked': time.time(),
+            }
+        elif entry:
+            return entry
+        else:
+            raise Exception(f"下载图片失败: {response.status_code}")
+
+        with self._lock:
+            self._index['urls'][url] = entry
+            blob = self._index['blobs'].setdefault(entry['hash'], {'size': 0})
+            blob['used'] = time.time()
+            blob['size'] = self._blob_size(entry['hash'])
+            self._evict(keep=entry['hash'])
+            self._save_index()
+        return entry
+
+    def _ensure_variant(self, digest, size):
+        """生成指定尺寸的缩放版本，QImage 可以在后台线程中使用"""
+        path = self._variant_path(digest, size)
+        if not os.path.exists(path):
+            image = QImage(self._blob_path(digest))
+            if image.isNull():
+                raise Exception("无法解码图片")
+            if image.width() > size or image.height() > size:
+                image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp.png"
+            if not image.save(tmp_path, "PNG"):
+                raise Exception("保存缩放图片失败")
+            os.replace(tmp_path, path)
+            with self._lock:
+                blob = self._index['blobs'].setdefault(digest, {'size': 0})
+                blob['size'] = self._blob_size(digest)
+                blob['used'] = time.time()
+                self._evict(keep=digest)
+                self._save_index()
+        return path
+
+    # ---------- 淘汰 ----------
+
+    def _variant_files(self, digest):
+        variants_dir = os.path.join(self.cache_dir, "variants")
+        if not os.path.isdir(variants_dir):
+            return []
+        return [os.path.join(variants_dir, name) for name in os.listdir(variants_dir)
+                if name.startswith(f"{digest}_")]
+
+    def _blob_size(self, digest):
+        total = 0
+        for path in [self._blob_path(digest)] + self._variant_files(digest):
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def _evict(self, keep=None):
+        """在持有 self._lock 时调用，删除最久未使用的图片直到总大小不超过上限"""
+        blobs = self._index['blobs']
+        total = sum(blob.get('size', 0) for blob in blobs.values())
+        for digest in sorted(blobs, key=lambda d: blobs[d].get('used', 0)):
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            for path in [self._blob_path(digest)] + self._variant_files(digest):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= blobs.pop(digest).get('size', 0)
+            self._index['urls'] = {url: entry for url, entry in self._index['urls'].items()
+                                   if entry['hash'] != digest}
+
+
+def load_card_icons(cards_by_url, size=AVATAR_LIST_SIZE):
+    """在 ClutCard 的标题前显示头像
+
+    cards_by_url: 头像 URL -> 卡片列表，同一 URL 只加载一次；
+    有缓存时立即显示，后台验证后图片有变化再替换。
+    """
+    cache = ImageCache.get_instance()
+    network = NetworkWorker.get_instance()
+    for url, cards in cards_by_url.items():
+        def show(path, cards=cards):
+            pixmap = QPixmap(path)
+            for card in cards:
+                card.set_icon(pixmap)
+
+        cached = cache.cached_path(url, size)
+        if cached:
+            show(cached)
+        network.submit(
+            cache.fetch, url, size,
+            on_success=lambda path, cached=cached, show=show: path != cached and show(path),
+            on_error=lambda error: print(f"加载头像失败: {error}")
+        )
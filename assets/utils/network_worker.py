@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class NetworkTask(QObject):
+    """一次后台网络调用，结果通过信号回到界面线程"""
+    succeeded = pyqtSignal(object)  # 函数返回值
+    failed = pyqtSignal(str)  # 异常信息
+    done = pyqtSignal()
+
+
+class NetworkWorker(QObject):
+    """后台网络任务执行器
+
+    界面线程中不能直接发起 HTTP 请求或 git 网络操作，把调用交给这里的线程池执行，
+    返回值和异常通过 NetworkTask 的信号在界面线程中处理。
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = NetworkWorker()
+        return cls._instance
+
+    def __init__(self, max_workers=4):
+        if NetworkWorker._instance is not None:
+            raise Exception("NetworkWorker 是单例类，请使用 get_instance() 方法获取实例")
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="network")
+        self._tasks = set()  # 保持引用直到任务结束
+        NetworkWorker._instance = self
+
+    def submit(self, fn, *args, on_success=None, on_error=None, **kwargs):
+        """在后台执行 fn(*args, **kwargs)，在界面线程中回调 on_success(结果) 或 on_error(错误信息)"""
+        task = NetworkTask()
+        if on_success:
+            task.succeeded.connect(on_success)
+        if on_error:
+            task.failed.connect(on_error)
+        task.done.connect(lambda: self._tasks.discard(task))
+        self._tasks.add(task)
+
+        def run():
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                task.failed.emit(str(e))
+            else:
+                task.succeeded.emit(result)
+            finally:
+                task.done.emit()
+
+        self._executor.submit(run)
+        return task
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from assets.utils.git_profile import CLONE_PROFILE
+
+
+def normalize_remote(repo_link):
+    """统一远程地址的写法，用于生成缓存中的引用命名空间"""
+    link = repo_link.strip().rstrip('/')
+    if link.endswith('.git'):
+        link = link[:-4]
+    return link.lower()
+
+
+class ObjectCache:
+    """本地共享对象库
+
+    所有克隆过的远程仓库都拉取到同一个裸仓库里，各自的分支放在
+    refs/remotes/<key>/ 下。git 对象按内容寻址，同一仓库的 fork
+    天然共享绝大部分对象。新克隆通过 --reference-if-able 借用这里的
+    对象，只需要从网络下载缓存中没有的部分。缓存只从克隆完成的本地目录
+    拉取，不访问网络，同样的对象不会下载两次。
+    """
+
+    def __init__(self, cache_dir, profile=CLONE_PROFILE):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.profile = profile
+        self._lock = threading.Lock()
+        # 单线程执行，避免多个 fetch 同时写入缓存
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def remote_key(self, repo_link):
+        return hashlib.sha1(normalize_remote(repo_link).encode('utf-8')).hexdigest()[:12]
+
+    def is_ready(self):
+        """缓存仓库是否已经存在"""
+        return os.path.isfile(os.path.join(self.cache_dir, 'HEAD'))
+
+    def reference_path(self):
+        """可用于 --reference-if-able 的路径，缓存不存在时返回 None"""
+        return self.cache_dir if self.is_ready() else None
+
+    def _git(self, *args):
+        return self.profile.run(
+            '--git-dir', self.cache_dir, *args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+
+    def _ensure_repo(self):
+        if self.is_ready():
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.profile.run('init', '--bare', '--quiet', self.cache_dir, check=True)
+        # 其他克隆通过 alternates 依赖这里的对象，永远不能清理
+        self._git('config', 'gc.pruneExpire', 'never')
+        self._git('config', 'gc.auto', '0')
+
+    def _has_all_objects(self, clone_path):
+        """目录不是浅克隆也不是部分克隆(如之后在这里更新的旧克隆)"""
+        def git(*args):
+            return self.profile.run('-C', clone_path, *args, capture_output=True, text=True).stdout.strip()
+        return (git('rev-parse', '--is-shallow-repository') == 'false'
+                and not git('config', '--get', 'extensions.partialClone'))
+
+    def refresh(self, repo_link, clone_path):
+        """把 repo_link 的完整克隆 clone_path 中的远程分支和标签拉取到缓存中
+
+        clone_path 必须有完整的对象，浅克隆或部分克隆缺少的对象会被 git 再去远程获取
+        """
+        if not self._has_all_objects(clone_path):
+            return False
+        key = self.remote_key(repo_link)
+        with self._lock:
+            self._ensure_repo()
+            result = self._git(
+                'fetch', '--no-tags', '--quiet', os.path.abspath(clone_path),
+                f'+refs/remotes/origin/*:refs/remotes/{key}/*',
+                f'+refs/tags/*:refs/tags/{key}/*'
+            )
+        if result.returncode != 0:
+            print(f"更新对象缓存失败: {repo_link}\n{result.stderr.strip()}")
+            return False
+        return True
+
+    def refresh_async(self, repo_link, clone_path):
+        """在后台更新缓存"""
+        return self._executor.submit(self.refresh, repo_link, clone_path)
@@ -7,6 +7,7 @@ from assets.pages.main_functions import GitClonePage
 from assets.pages.process_page import ProcessPage
 from assets.pages.push_mainfunc import PushMainFuncPage
 from assets.utils.style_loader import load_stylesheet
+from assets.utils.http_client import HttpClient
 
 
 class PageManager:
@@ -43,11 +44,12 @@ class PageManager:
         # 页面列表，保持顺序与侧边栏按钮一致
         self.page_list = [button[1] for button in self.sidebar_buttons]
         
-        # 初始化页面，使用单例模式获取 ProcessPage
+        # 初始化页面，使用单例模式获取 ProcessPage，需要访问网络的页面共用同一个 HTTP 客户端
+        http = HttpClient.get_instance()
         self.pages = {
             "home": HomePage(),
-            "account_page": AccountPage(),
-            "main_functions": GitClonePage(),
+            "account_page": AccountPage(http=http),
+            "main_functions": GitClonePage(http=http),
             "push_mainfunc": PushMainFuncPage(),
             "process_page": ProcessPage.get_instance(),
             "about": AboutPage(),
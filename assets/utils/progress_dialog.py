@@ -1,7 +1,8 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                            QProgressBar, QPushButton)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 from assets.utils.clut_button import ClutButton
+from assets.utils.git_progress import format_size, format_eta
 from PyQt5.QtWidgets import QWidget
 
 class ClutProgressDialog(QDialog):
@@ -77,10 +78,12 @@ class ClutProgressDialog(QDialog):
         button_layout.addStretch()
         
         # 创建按钮但先不添加
+        self.cancel_button = ClutButton("取消", primary=False)
         self.background_button = ClutButton("后台运行", primary=False)
         self.view_button = ClutButton("查看", primary=True)
         self.close_button = ClutButton("关闭", primary=False)
         
+        button_layout.addWidget(self.cancel_button)
         if can_background:
             button_layout.addWidget(self.background_button)
             # 默认隐藏其他按钮
@@ -100,34 +103,28 @@ class ClutProgressDialog(QDialog):
         # 添加背景小部件到主布局
         main_layout.addWidget(self.bg_widget)
         
-        # 初始化速度计算
-        self._last_bytes = 0
-        self._speed_timer = QTimer()
-        self._speed_timer.timeout.connect(self._update_speed)
-        self._speed_timer.start(1000)  # 每秒更新一次
-        
-    def _update_speed(self):
-        """更新下载速度"""
-        current_bytes = self.progress_bar.value()
-        speed = current_bytes - self._last_bytes
-        self._last_bytes = current_bytes
-        
-        if speed < 1024:
-            speed_text = f"{speed} B/s"
-        elif speed < 1024 * 1024:
-            speed_text = f"{speed/1024:.1f} KB/s"
-        else:
-            speed_text = f"{speed/1024/1024:.1f} MB/s"
-            
-        self.speed_label.setText(f"速度: {speed_text}")
+    def update_transfer(self, received_bytes, speed, eta):
+        """更新已接收字节、速度(字节/秒)和剩余时间"""
+        self.speed_label.setText(
+            f"速度: {format_size(speed)}/s | 已接收: {format_size(received_bytes)} | 剩余: {format_eta(eta)}"
+        )
         
     def update_progress(self, value, total):
         """更新进度"""
-        percentage = int(value / total * 100)
+        percentage = int(value / total * 100) if total else 0
+        self.progress_bar.setMaximum(total if total else 100)
         self.progress_bar.setValue(value)
-        self.progress_bar.setMaximum(total)
         self.progress_label.setText(f"{percentage}%")
         
+    def update_clone_progress(self, info):
+        """根据 GitProgressParser 的进度信息更新界面"""
+        self.update_progress(info['percent'], 100)
+        if 'detail' in info:
+            # 子模块等汇总进度只提供百分比和说明文字
+            self.speed_label.setText(info['detail'])
+            return
+        self.update_transfer(info['bytes'], info['speed'], info['eta'])
+        
     def set_status(self, text):
         """更新状态文本"""
         self.status_label.setText(text)
@@ -135,6 +132,7 @@ class ClutProgressDialog(QDialog):
     def on_clone_complete(self):
         """克隆完成时更新UI"""
         self.status_label.setText("克隆完成")
+        self.update_progress(100, 100)
         self.progress_bar.setStyleSheet("""
             QProgressBar {
                 background: rgba(255, 255, 255, 0.1);
@@ -149,6 +147,7 @@ class ClutProgressDialog(QDialog):
             }
         """)
         # 切换按钮
+        self.cancel_button.hide()
         self.background_button.hide()
         self.view_button.show()
         self.close_button.show()
\ No newline at end of file
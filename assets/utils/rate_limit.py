@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# 请求优先级: 用户操作触发的请求 / 后台预取
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+# 没有 Retry-After 时，触发次级速率限制后等待的秒数
+SECONDARY_LIMIT_WAIT = 60
+
+
+class RateLimitError(Exception):
+    """GitHub API 配额不足，用户请求无法立即发出"""
+
+
+def token_key(token, resource='core'):
+    """不直接保存 token，按其摘要区分配额；GraphQL 等接口的配额与 REST 分开计算"""
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16] if token else 'anonymous'
+    return key if resource == 'core' else f"{key}:{resource}"
+
+
+class RateLimiter(QObject):
+    """按 token 跟踪 GitHub API 的剩余配额
+
+    从每个响应的 X-RateLimit-* 头更新剩余次数和重置时间，次级限制的 Retry-After 也会记录下来。
+    配额低于保留量时后台请求等待到重置时间再发出，保留的配额留给用户操作；
+    配额用完时用户请求直接报错，不会卡住界面。
+    """
+    budget_changed = pyqtSignal(str, int, int, float)  # (token 摘要, 剩余, 上限, 重置时间戳)
+
+    def __init__(self, reserve_ratio=0.1, min_reserve=20, clock=time.time, sleep=time.sleep):
+        super().__init__()
+        self.reserve_ratio = reserve_ratio
+        self.min_reserve = min_reserve
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._budgets = {}  # token 摘要 -> {'limit', 'remaining', 'reset', 'blocked_until'}
+
+    def budget(self, token, resource='core'):
+        """返回 (剩余, 上限, 重置时间戳)，还没有请求过时返回 None"""
+        with self._lock:
+            state = self._budgets.get(token_key(token, resource))
+            if not state or state.get('limit') is None:
+                return None
+            return state['remaining'], state['limit'], state['reset']
+
+    def _reserve(self, state):
+        return max(self.min_reserve, int(state['limit'] * self.reserve_ratio))
+
+    def _wait_time(self, state, priority):
+        """发出请求前需要等待的秒数，0 表示可以立即发出"""
+        now = self._clock()
+        if state.get('blocked_until', 0) > now:
+            return state['blocked_until'] - now
+        if state.get('limit') is None or state['reset'] <= now:
+            return 0
+        floor = self._reserve(state) if priority == BACKGROUND else 0
+        if state['remaining'] > floor:
+            return 0
+        return state['reset'] - now + 1
+
+    def acquire(self, token, priority=INTERACTIVE, resource='core'):
+        """请求前调用；后台请求在配额不足时等待，用户请求在配额不足时抛出 RateLimitError"""
+        key = token_key(token, resource)
+        while True:
+            with self._lock:
+                state = self._budgets.setdefault(key, {})
+                wait = self._wait_time(state, priority)
+                if wait <= 0:
+                    # 先占用一次，避免并发请求同时用掉最后的配额
+                    if state.get('limit') is not None:
+                        state['remaining'] = max(0, state['remaining'] - 1)
+                    return
+            if priority != BACKGROUND:
+                resume = time.strftime('%H:%M:%S', time.localtime(self._clock() + wait))
+                raise RateLimitError(f"GitHub API 配额已用完，{resume} 后恢复")
+            self._sleep(min(wait, 30))
+
+    def update(self, token, response, resource='core'):
+        """根据响应头更新配额，返回该响应是否因速率限制被拒绝"""
+        key = token_key(token, resource)
+        headers = response.headers
+        limited = False
+        with self._lock:
+            state = self._budgets.setdefault(key, {})
+            if headers.get('X-RateLimit-Limit'):
+                state['limit'] = int(headers['X-RateLimit-Limit'])
+                state['remaining'] = int(headers.get('X-RateLimit-Remaining', 0))
+                state['reset'] = float(headers.get('X-RateLimit-Reset', 0))
+            if response.status_code in (403, 429):
+                retry_after = headers.get('Retry-After')
+                if retry_after:
+                    state['blocked_until'] = self._clock() + int(retry_after)
+                    limited = True
+                elif state.get('limit') is not None and state['remaining'] == 0:
+                    limited = True
+                elif 'rate limit' in response.text.lower():
+                    state['blocked_until'] = self._clock() + SECONDARY_LIMIT_WAIT
+                    limited = True
+            snapshot = (state.get('remaining'), state.get('limit'), state.get('reset'))
+        if snapshot[1] is not None:
+            self.budget_changed.emit(key, snapshot[0], snapshot[1], snapshot[2])
+        return limited
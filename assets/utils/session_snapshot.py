@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# 仓库卡片实际显示和使用的字段，快照中只保存这些
+REPO_FIELDS = ('name', 'description', 'language', 'stargazers_count', 'html_url', 'clone_url')
+
+
+def trim_repo(repo):
+    """只保留卡片需要的字段，REST 和 GraphQL 的结果可以直接比较"""
+    trimmed = {field: repo.get(field) for field in REPO_FIELDS}
+    trimmed['owner'] = {'avatar_url': (repo.get('owner') or {}).get('avatar_url')}
+    return trimmed
+
+
+def stale_text(saved_at):
+    """快照的保存时间，用于标记界面上的离线数据"""
+    return datetime.fromtimestamp(saved_at).strftime('%m-%d %H:%M')
+
+
+class SessionSnapshot:
+    """上次会话的界面数据
+
+    账户卡片、仓库列表和推送页面的仓库保存在 cache/session.json 中，
+    启动时先用这些数据立即显示界面并标记为离线数据，再在后台向 GitHub 重新获取，
+    窗口可用的时间不取决于网络。每一部分记录所属用户，切换账户后不会显示别人的数据。
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = SessionSnapshot()
+        return cls._instance
+
+    def __init__(self, path="cache/session.json"):
+        if SessionSnapshot._instance is not None:
+            raise Exception("SessionSnapshot 是单例类，请使用 get_instance() 方法获取实例")
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = self._load()
+        SessionSnapshot._instance = self
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"读取会话快照失败: {str(e)}")
+        return {}
+
+    def _save(self):
+        """在持有 self._lock 时调用"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"保存会话快照失败: {str(e)}")
+
+    def get(self, section, owner=None):
+        """返回 (数据, 保存时间戳)，没有快照或属于其他用户时返回 (None, None)"""
+        with self._lock:
+            entry = self._data.get(section)
+        if not entry or entry.get('owner') != owner:
+            return None, None
+        return entry['value'], entry['saved_at']
+
+    def put(self, section, value, owner=None):
+        with self._lock:
+            self._data[section] = {'owner': owner, 'value': value, 'saved_at': time.time()}
+            self._save()
+
+    def remove(self, *sections):
+        with self._lock:
+            for section in sections:
+                self._data.pop(section, None)
+            self._save()
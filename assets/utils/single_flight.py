@@ -0,0 +1,68 @@
+import threading
+import time
+
+
+class _Call:
+    """一次正在进行的调用，等待者在 event 上等待结果"""
+
+    def __init__(self, urgent):
+        self.urgent = urgent
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """合并相同的并发调用
+
+    同一个 key 同时只执行一次，其余调用方等待并拿到同一个结果(或同一个异常)；
+    成功的结果在内存中保留 ttl 秒，紧接着的相同调用直接返回，不再执行。
+    紧急的调用不等待不紧急的调用(它可能正在等待配额恢复)，而是自己执行并接替它，
+    之后到达的调用等待紧急的这一次；不紧急的调用可以等待任何调用。
+    """
+
+    def __init__(self, ttl=5, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> 正在进行的 _Call
+        self._results = {}  # key -> (过期时间, 结果)
+
+    def do(self, key, fn, cacheable=None, urgent=True):
+        """执行 fn() 或复用相同 key 的结果；cacheable(结果) 为 False 时结果不进入内存缓存"""
+        with self._lock:
+            cached = self._results.get(key)
+            if cached and cached[0] > self._clock():
+                return cached[1]
+            call = self._calls.get(key)
+            leader = call is None or (urgent and not call.urgent)
+            if leader:
+                call = self._calls[key] = _Call(urgent)
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # 可能已被紧急的调用接替
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                now = self._clock()
+                self._results = {k: v for k, v in self._results.items() if v[0] > now}
+                if call.error is None and (cacheable is None or cacheable(call.result)):
+                    self._results[key] = (now + self.ttl, call.result)
+            call.event.set()
+        return call.result
+
+    def clear(self):
+        """丢弃内存中的结果，正在进行的调用不受影响"""
+        with self._lock:
+            self._results.clear()
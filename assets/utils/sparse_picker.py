@@ -0,0 +1,198 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QWidget,
+                           QTreeWidget, QTreeWidgetItem)
+from PyQt5.QtCore import Qt
+from assets.utils.clut_button import ClutButton
+from assets.utils.http_client import HttpClient
+from assets.utils.network_worker import NetworkWorker
+import re
+
+
+def parse_github_repo(repo_link):
+    """从 GitHub 链接中解析 (owner, repo)，不是 GitHub 链接时返回 None"""
+    match = re.match(
+        r'^(?:https?://(?:[^@/]+@)?github\.com/|git@github\.com:)([^/]+)/([^/]+?)(?:\.git)?/?$',
+        repo_link.strip()
+    )
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
+class RemoteTreeLoader:
+    """通过 GitHub trees API 按层加载远程仓库的目录结构
+
+    只在展开目录时请求这一层，结果按 tree sha 缓存，tree sha 对应的内容不会变化，
+    同一仓库再次打开选择器时不会重复请求。分支会随推送移动，每个 loader(每次打开选择器)
+    都重新把默认分支解析为根目录的 tree sha。
+    """
+    _cache = {}  # (owner, repo, tree_sha) -> 目录项列表
+
+    def __init__(self, owner, repo, token=None, http=None):
+        self.owner = owner
+        self.repo = repo
+        self.token = token
+        self.http = http or HttpClient.get_instance()
+        self._default_branch = None
+        self._root_sha = None  # 默认分支当前的根目录 tree sha
+
+    def _get(self, path):
+        response = self.http.get(
+            f'https://api.github.com/repos/{self.owner}/{self.repo}{path}',
+            token=self.token
+        )
+        if response.status_code != 200:
+            message = response.json().get('message', '请求失败')
+            raise Exception(f"GitHub API错误: {message}")
+        return response.json()
+
+    def default_branch(self):
+        if self._default_branch is None:
+            self._default_branch = self._get('')['default_branch']
+        return self._default_branch
+
+    def list_dir(self, tree_sha=None):
+        """列出一层目录，tree_sha 为空时列出默认分支的根目录"""
+        if tree_sha is None:
+            if self._root_sha is None:
+                tree = self._get(f'/git/trees/{self.default_branch()}')
+                self._root_sha = tree['sha']
+                self._cache[(self.owner, self.repo, self._root_sha)] = self._entries(tree)
+            tree_sha = self._root_sha
+        key = (self.owner, self.repo, tree_sha)
+        if key not in self._cache:
+            self._cache[key] = self._entries(self._get(f'/git/trees/{tree_sha}'))
+        return self._cache[key]
+
+    @staticmethod
+    def _entries(tree):
+        return [
+            {'name': entry['path'], 'type': entry['type'], 'sha': entry['sha']}
+            for entry in tree.get('tree', [])
+        ]
+
+
+class SparsePathDialog(QDialog):
+    """选择稀疏检出目录的对话框"""
+
+    def __init__(self, loader, selected=None, parent=None):
+        super().__init__(parent)
+        self.loader = loader
+        self._initial = set(selected or [])
+        self._seen = set()  # 已加载到树中的目录
+        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setFixedSize(500, 480)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+
+        bg_widget = QWidget()
+        bg_widget.setObjectName("bg_widget")
+        bg_widget.setStyleSheet("""
+            QWidget#bg_widget {
+                background: #2d2d2d;
+                border-radius: 8px;
+                border: 1px solid rgba(255, 255, 255, 0.1);
+            }
+        """)
+
+        content_layout = QVBoxLayout(bg_widget)
+        content_layout.setContentsMargins(20, 20, 20, 20)
+        content_layout.setSpacing(12)
+
+        title_label = QLabel(f"| 选择检出目录 - {loader.owner}/{loader.repo}")
+        title_label.setStyleSheet("""
+            color: white;
+            font-size: 16px;
+            font-weight: bold;
+        """)
+        self.status_label = QLabel("勾选需要检出的目录，未勾选的目录不会写入磁盘")
+        self.status_label.setStyleSheet("color: rgba(255,255,255,0.7); font-size: 12px;")
+        self.status_label.setWordWrap(True)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderHidden(True)
+        self.tree.setStyleSheet("""
+            QTreeWidget {
+                background: rgba(255, 255, 255, 0.05);
+                border: 1px solid rgba(255, 255, 255, 0.1);
+                border-radius: 4px;
+                color: white;
+            }
+        """)
+        self.tree.itemExpanded.connect(self._on_item_expanded)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        cancel_button = ClutButton("取消", primary=False)
+        cancel_button.clicked.connect(self.reject)
+        ok_button = ClutButton("确定", primary=True)
+        ok_button.clicked.connect(self.accept)
+        button_layout.addWidget(cancel_button)
+        button_layout.addWidget(ok_button)
+
+        content_layout.addWidget(title_label)
+        content_layout.addWidget(self.status_label)
+        content_layout.addWidget(self.tree, 1)
+        content_layout.addLayout(button_layout)
+        main_layout.addWidget(bg_widget)
+
+        self._populate(self.tree.invisibleRootItem(), None, "")
+
+    def _populate(self, parent_item, tree_sha, prefix):
+        """在后台加载一层目录，完成后添加到 parent_item 下"""
+        loading_item = QTreeWidgetItem(["正在加载..."])
+        loading_item.setFlags(Qt.NoItemFlags)
+        parent_item.addChild(loading_item)
+
+        def on_success(entries):
+            parent_item.removeChild(loading_item)
+            self._add_entries(parent_item, entries, prefix)
+
+        def on_error(error):
+            parent_item.removeChild(loading_item)
+            self.status_label.setText(f"加载目录失败: {error}")
+
+        NetworkWorker.get_instance().submit(
+            self.loader.list_dir, tree_sha,
+            on_success=on_success,
+            on_error=on_error
+        )
+
+    def _add_entries(self, parent_item, entries, prefix):
+        for entry in entries:
+            # cone 模式按目录检出，只列出目录
+            if entry['type'] != 'tree':
+                continue
+            path = f"{prefix}{entry['name']}"
+            self._seen.add(path)
+            item = QTreeWidgetItem([entry['name']])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.Checked if path in self._initial else Qt.Unchecked)
+            item.setData(0, Qt.UserRole, path)
+            item.setData(0, Qt.UserRole + 1, entry['sha'])
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            parent_item.addChild(item)
+        if parent_item.childCount() == 0:
+            parent_item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicator)
+
+    def _on_item_expanded(self, item):
+        """首次展开时加载子目录"""
+        if item.data(0, Qt.UserRole + 2):
+            return
+        item.setData(0, Qt.UserRole + 2, True)
+        self._populate(item, item.data(0, Qt.UserRole + 1), f"{item.data(0, Qt.UserRole)}/")
+
+    def selected_paths(self):
+        """返回所有勾选的目录路径"""
+        # 之前选中但这次没有展开到的目录保持选中
+        paths = [path for path in self._initial if path not in self._seen]
+        stack = [self.tree.invisibleRootItem()]
+        while stack:
+            parent = stack.pop()
+            for i in range(parent.childCount()):
+                item = parent.child(i)
+                if item.checkState(0) == Qt.Checked:
+                    paths.append(item.data(0, Qt.UserRole))
+                stack.append(item)
+        return sorted(paths)
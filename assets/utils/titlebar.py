@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QFrame, QHBoxLayout, QPushButton, QLabel, QApplication
 from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QRect, QPoint
+from assets.utils.circuit_breaker import CircuitBreaker
 
 class Clut_Bar(QFrame):
     def __init__(self, parent=None):
@@ -40,6 +41,15 @@ class Clut_Bar(QFrame):
         self.title = QLabel(" ClutCommitCanvas")
         self.title.setStyleSheet("font-size: 14px; font-weight: bold;")
         layout.addWidget(self.title)
+        
+        # 离线状态，有主机被熔断时显示
+        self.breaker = CircuitBreaker.get_instance()
+        self.offline_label = QLabel()
+        self.offline_label.setStyleSheet("color: #FFB74A; font-size: 12px;")
+        self.offline_label.hide()
+        layout.addWidget(self.offline_label)
+        layout.addStretch()
+        self.breaker.state_changed.connect(self.update_connectivity)
 
         self.min_button = QPushButton()
         self.min_button.setIcon(QIcon("assets/icons/mini.png"))
@@ -69,6 +79,12 @@ class Clut_Bar(QFrame):
         self.animation.setDuration(150)  # 稍微增加动画时间使其更流畅
         self.animation.setEasingCurve(QEasingCurve.InOutQuad)  # 使用更自然的缓动曲线
         
+    def update_connectivity(self, host, online):
+        """显示当前离线的主机"""
+        hosts = self.breaker.offline_hosts()
+        self.offline_label.setText(f"● 离线: {', '.join(hosts)}")
+        self.offline_label.setVisible(bool(hosts))
+        
     def toggle_maximize_animation(self):
         """切换最大化状态的动画"""
         if self.animation.state() == QPropertyAnimation.Running:
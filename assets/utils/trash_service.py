@@ -0,0 +1,134 @@
+import json
+import os
+import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PyQt5.QtCore import QThread, pyqtSignal
+
+TRASH_DIR_NAME = ".clut_trash"
+REGISTRY_FILE = "config/trash_dirs.json"
+
+
+def _on_rm_error(func, path, exc_info):
+    """删除只读文件时先修改权限再重试"""
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def _load_registry():
+    if not os.path.exists(REGISTRY_FILE):
+        return []
+    try:
+        with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"读取回收目录列表失败: {str(e)}")
+        return []
+
+
+def _register_trash_root(trash_root):
+    roots = _load_registry()
+    if trash_root in roots:
+        return
+    roots.append(trash_root)
+    os.makedirs(os.path.dirname(REGISTRY_FILE), exist_ok=True)
+    with open(REGISTRY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(roots, f)
+
+
+def move_to_trash(path):
+    """把目录重命名到同级的回收区，返回回收区中的新路径
+
+    重命名在同一文件系统内完成，与目录大小无关，调用后原路径立即可用。
+    """
+    path = os.path.abspath(path)
+    trash_root = os.path.join(os.path.dirname(path), TRASH_DIR_NAME)
+    os.makedirs(trash_root, exist_ok=True)
+    trash_path = os.path.join(trash_root, f"{os.path.basename(path)}-{time.time_ns()}")
+    os.rename(path, trash_path)
+    _register_trash_root(trash_root)
+    return trash_path
+
+
+def pending_trash():
+    """列出上次运行时没有删完的回收区目录"""
+    items = []
+    for trash_root in _load_registry():
+        if not os.path.isdir(trash_root):
+            continue
+        for name in os.listdir(trash_root):
+            items.append(os.path.join(trash_root, name))
+    return items
+
+
+def _collect_units(root, target=32, max_depth=3):
+    """把目录拆成若干可以并行删除的子树"""
+    units = []
+    dirs = [root]
+    for _ in range(max_depth):
+        next_dirs = []
+        for directory in dirs:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        next_dirs.append(entry.path)
+                    else:
+                        units.append(entry.path)
+        if not next_dirs or len(units) + len(next_dirs) >= target:
+            return units + next_dirs
+        dirs = next_dirs
+    return units + dirs
+
+
+def _delete_unit(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, onerror=_on_rm_error)
+    else:
+        try:
+            os.remove(path)
+        except PermissionError:
+            os.chmod(path, stat.S_IWRITE)
+            os.remove(path)
+
+
+class DeleteThread(QThread):
+    """在后台并行删除回收区中的目录，信号与 CloneThread 一致，可显示在进程页面"""
+    progress = pyqtSignal(str)
+    progress_info = pyqtSignal(dict)
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, trash_path, workers=8):
+        super().__init__()
+        self.trash_path = trash_path
+        self.workers = workers
+        self.mode_label = "后台删除"
+
+    def run(self):
+        try:
+            self.progress.emit("正在统计待删除内容...")
+            units = _collect_units(self.trash_path)
+            total = len(units)
+            done = 0
+
+            self.progress.emit("正在删除...")
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(_delete_unit, unit) for unit in units]
+                for future in as_completed(futures):
+                    future.result()
+                    done += 1
+                    self.progress_info.emit({
+                        'percent': int(done / total * 100) if total else 100,
+                        'detail': f"已删除 {done}/{total} 项",
+                    })
+
+            # 删除剩余的空目录骨架
+            shutil.rmtree(self.trash_path, onerror=_on_rm_error)
+            trash_root = os.path.dirname(self.trash_path)
+            try:
+                os.rmdir(trash_root)
+            except OSError:
+                pass  # 回收区中还有其他待删除的目录
+            self.finished.emit(True, "删除完成")
+        except Exception as e:
+            self.finished.emit(False, f"删除失败: {str(e)}")
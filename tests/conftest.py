@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 程序以仓库根目录为工作目录运行，assets 按顶层包导入
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
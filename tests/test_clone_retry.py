@@ -0,0 +1,46 @@
+import pytest
+from assets.utils.clone_retry import RetryPolicy, classify_failure
+
+UNKNOWN_ERRORS = [
+    "warning: Could not find remote branch nope to clone.\nfatal: Remote branch nope not found in upstream origin",
+    "fatal: protocol 'htps' is not supported",
+    "error: unknown switch `x'",
+    "fatal: could not create work tree dir 'repo': Read-only file system",
+]
+
+
+@pytest.mark.parametrize("stderr", UNKNOWN_ERRORS)
+def test_unknown_error_is_not_retried(stderr):
+    kind = classify_failure(stderr)
+    assert kind == 'other'
+    assert not RetryPolicy().should_retry(kind, 1)
+
+
+@pytest.mark.parametrize("stderr", [
+    "error: RPC failed; curl 18 transfer closed with outstanding read data remaining",
+    "fatal: early EOF",
+    "fatal: the remote end hung up unexpectedly",
+    "fatal: unable to access 'https://github.com/a/b.git/': Failed to connect to github.com port 443",
+])
+def test_transport_error_is_retried(stderr):
+    assert RetryPolicy().should_retry(classify_failure(stderr), 1)
+
+
+def test_unknown_error_fails_on_first_attempt(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt5")
+    pytest.importorskip("requests")
+    pytest.importorskip("git")
+    from assets.pages.main_functions import CloneThread, GitCommandError
+
+    thread = CloneThread("https://github.com/owner/repo.git", str(tmp_path / 'repo'),
+                         retry_policy=RetryPolicy(base_delay=0))
+    attempts = []
+
+    def fail(mode, resume):
+        attempts.append(mode)
+        raise GitCommandError("git 命令失败", UNKNOWN_ERRORS[0])
+
+    monkeypatch.setattr(thread, '_clone_once', fail)
+    with pytest.raises(Exception, match="未知错误"):
+        thread._clone_with_retry()
+    assert len(attempts) == 1
@@ -0,0 +1,35 @@
+import pytest
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("PyQt5")
+
+from assets.utils.http_cache import HttpCache
+from assets.utils.http_client import HttpClient
+from assets.utils.rate_limit import BACKGROUND, INTERACTIVE
+
+
+@pytest.fixture
+def http(tmp_path):
+    HttpClient._instance = None
+    client = HttpClient(cache=HttpCache(str(tmp_path)))
+    yield client
+    HttpClient._instance = None
+
+
+def test_background_and_interactive_requests_share_one_call(http, monkeypatch):
+    calls = []
+
+    def fake_request(self, method, url, **kwargs):
+        calls.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'[]'
+        response.url = url
+        return response
+
+    monkeypatch.setattr(requests.Session, 'request', fake_request)
+    url = "https://api.github.com/users/octocat/repos"
+    http.get(url, token="ghp_test", priority=INTERACTIVE)
+    http.get(url, token="ghp_test", priority=BACKGROUND)
+
+    assert len(calls) == 1
@@ -0,0 +1,49 @@
+import subprocess
+from assets.utils.git_profile import GitProfile
+from assets.utils.object_cache import ObjectCache
+
+# 只允许本地路径，任何网络访问都会失败
+OFFLINE_PROFILE = GitProfile(
+    config={'protocol.allow': 'never', 'protocol.file.allow': 'always'},
+    env={'LC_ALL': 'C', 'GIT_TERMINAL_PROMPT': '0'}
+)
+
+
+def git(*args, cwd=None):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   cwd=cwd, check=True, capture_output=True)
+
+
+def make_clone(tmp_path, *clone_args):
+    source = tmp_path / 'source'
+    git('init', '--quiet', str(source))
+    (source / 'README').write_text('hello')
+    git('add', 'README', cwd=source)
+    git('commit', '--quiet', '-m', 'init', cwd=source)
+    git('tag', 'v1', cwd=source)
+    clone = tmp_path / 'clone'
+    git('clone', '--quiet', *clone_args, f'file://{source}', str(clone))
+    # 远程地址换成无法访问的主机，refresh 一旦联网就会失败
+    git('remote', 'set-url', 'origin', 'https://unreachable.invalid/owner/repo.git', cwd=clone)
+    return clone
+
+
+def test_refresh_fills_cache_from_local_clone(tmp_path):
+    clone = make_clone(tmp_path)
+    cache = ObjectCache(str(tmp_path / 'cache.git'), profile=OFFLINE_PROFILE)
+    repo_link = 'https://unreachable.invalid/owner/repo.git'
+
+    assert cache.refresh(repo_link, str(clone))
+
+    key = cache.remote_key(repo_link)
+    refs = subprocess.run(['git', '--git-dir', cache.cache_dir, 'for-each-ref', '--format=%(refname)'],
+                          capture_output=True, text=True, check=True).stdout.split()
+    assert any(ref.startswith(f'refs/remotes/{key}/') for ref in refs)
+    assert f'refs/tags/{key}/v1' in refs
+
+
+def test_refresh_skips_shallow_clone(tmp_path):
+    clone = make_clone(tmp_path, '--depth', '1')
+    cache = ObjectCache(str(tmp_path / 'cache.git'), profile=OFFLINE_PROFILE)
+
+    assert not cache.refresh('https://unreachable.invalid/owner/repo.git', str(clone))
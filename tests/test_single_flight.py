@@ -0,0 +1,59 @@
+import threading
+from assets.utils.single_flight import SingleFlight
+
+
+def test_background_caller_joins_urgent_flight():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do('key', fetch, urgent=True)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flights.do('key', fetch, urgent=False)))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == ['result', 'result']
+    assert len(calls) == 1
+
+
+def test_background_caller_reuses_urgent_result():
+    flights = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return 'result'
+
+    assert flights.do('key', fetch, urgent=True) == 'result'
+    assert flights.do('key', fetch, urgent=False) == 'result'
+    assert len(calls) == 1
+
+
+def test_urgent_caller_does_not_wait_for_background_leader():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'background'
+
+    leader = threading.Thread(target=lambda: flights.do('key', slow, urgent=False))
+    leader.start()
+    started.wait(5)
+    try:
+        assert flights.do('key', lambda: 'interactive', urgent=True) == 'interactive'
+    finally:
+        release.set()
+        leader.join(5)